@@ -0,0 +1,134 @@
+#!venv/bin/python
+
+import argparse
+import os
+import sys
+import time
+from typing import Dict, List, Tuple
+
+import requests
+from bs4 import BeautifulSoup
+
+from kicker_scraper_cli import (
+    CHUNK_SIZE,
+    STATS_CLASSES,
+    VISITORS_CLASSES,
+    check_internet,
+    check_league_season,
+    get_urls_matchday,
+    parse_stats_match,
+    parse_visitors_match,
+    read_blocks,
+)
+
+# Kinds of the recorded sites with the classes of their blocks and parsers
+KINDS = {
+    "stats": (STATS_CLASSES, parse_stats_match),
+    "visitors": (VISITORS_CLASSES, parse_visitors_match),
+}
+
+
+def record_matchday(league: str, season: str, matchday: int, dirpath: str):
+    """Saves the game stats and game info sites of the matches of a match
+    day to a directory as <kind>_<i>.html."""
+    os.makedirs(dirpath, exist_ok=True)
+    for url_type, kind in enumerate(KINDS):
+        urls = get_urls_matchday(league, season, matchday, url_type)
+        for i, url in enumerate(urls):
+            content = requests.get("https://www.kicker.de" + url).content
+            path = os.path.join(dirpath, f"{kind}_{i}.html")
+            with open(path, "wb") as f:
+                f.write(content)
+
+
+def measure_site(kind: str, content: bytes) -> Dict[str, Tuple[int, float]]:
+    """Parses a recorded site once as a whole and once streamed in chunks
+    and returns the bytes read and the seconds spent for both. Raises a
+    ValueError if the records differ."""
+
+    classes, parse = KINDS[kind]
+
+    start = time.perf_counter()
+    record_full = parse(BeautifulSoup(content, "html.parser"))
+    seconds_full = time.perf_counter() - start
+
+    start = time.perf_counter()
+    chunks = (
+        content[i:i + CHUNK_SIZE] for i in range(0, len(content), CHUNK_SIZE)
+    )
+    html, n_bytes = read_blocks(chunks, classes)
+    record_stream = parse(BeautifulSoup(html, "html.parser"))
+    seconds_stream = time.perf_counter() - start
+
+    if record_full != record_stream:
+        raise ValueError(f"The streamed {kind} record differs.")
+
+    return {
+        "full": (len(content), seconds_full),
+        "stream": (n_bytes, seconds_stream),
+    }
+
+
+def measure_dir(dirpath: str) -> List[Tuple[str, Dict]]:
+    """Measures all recorded sites in a directory, see measure_site."""
+    results = []
+    for filename in sorted(os.listdir(dirpath)):
+        kind = filename.split("_")[0]
+        if kind not in KINDS or not filename.endswith(".html"):
+            continue
+        with open(os.path.join(dirpath, filename), "rb") as f:
+            results.append((filename, measure_site(kind, f.read())))
+    return results
+
+
+def main():
+
+    parser = argparse.ArgumentParser(
+        description=(
+            "Compare the bytes read and the parse time of whole and "
+            "streamed match sites recorded in a directory."
+        )
+    )
+    parser.add_argument(
+        "-d",
+        "--dir",
+        help="The path of the directory of the recorded sites.",
+        required=False,
+        default="recorded",
+    )
+    parser.add_argument(
+        "--record",
+        nargs=3,
+        metavar=("LEAGUE", "SEASON", "MATCHDAY"),
+        help="Record the sites of the matches of a match day first.",
+        required=False,
+    )
+    args = parser.parse_args()
+
+    if args.record is not None:
+        league, season, matchday = args.record
+        check_league_season(league, season)
+        if not check_internet():
+            print("Internet connection or kicker.de down!")
+            sys.exit()
+        record_matchday(league, season, int(matchday), args.dir)
+
+    totals = {"full": [0, 0.0], "stream": [0, 0.0]}
+    for filename, result in measure_dir(args.dir):
+        print(
+            f"{filename}: {result['full'][0]} -> {result['stream'][0]} "
+            f"bytes, {result['full'][1] * 1000:.1f} -> "
+            f"{result['stream'][1] * 1000:.1f} ms"
+        )
+        for mode in totals:
+            totals[mode][0] += result[mode][0]
+            totals[mode][1] += result[mode][1]
+    print(
+        f"Total: {totals['full'][0]} -> {totals['stream'][0]} bytes, "
+        f"{totals['full'][1] * 1000:.1f} -> "
+        f"{totals['stream'][1] * 1000:.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,291 @@
 #!venv/bin/python
 
 import argparse
+import codecs
+import multiprocessing
 import os
+import queue
 import sys
-from typing import Dict, List, Tuple
-
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from html import escape
+from html.parser import HTMLParser
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+import numpy as np
 import pandas as pd
 import requests
 from bs4 import BeautifulSoup
+from bs4.dammit import EncodingDetector
+
+# Leagues, seasons and number of match days supported
+LEAGUES = [
+    "bundesliga",
+    "la-liga",
+    "premier-league",
+    "serie-a",
+]
+SEASONS_BULI = [
+    "2021-22",
+    "2020-21",
+    "2019-20",
+    "2018-19",
+    "2017-18",
+    "2016-17",
+    "2015-16",
+    "2014-15",
+    "2013-14",
+]
+SEASONS_OTHERS = [
+    "2021-22",
+    "2020-21",
+    "2019-20",
+    "2018-19",
+]
+MATCHDAYS = {
+    "bundesliga": 34,
+    "la-liga": 38,
+    "premier-league": 38,
+    "serie-a": 38,
+}
+
+# Substitutions for the names of some stats
+STATS_SUBS = {
+    "Laufleistung": "Laufleistung in km",
+    "Passquote": "Passquote in %",
+    "Ballbesitz": "Ballbesitz in %",
+    "Zweikampfquote": "Zweikampfquote in %",
+}
+
+# Classes of the blocks with the data on the game stats and game info sites
+STATS_CLASSES = [
+    "kick__data-grid--max-width kick__data-grid--max-width",
+    "kick__compare-select__row kick__compare-select__row--left",
+    "kick__compare-select__row kick__compare-select__row--right",
+]
+VISITORS_CLASSES = [
+    "kick__v100-gameCell kick__v100-gameCell--big",
+    "kick__gameinfo-block kick__tabular-nums",
+]
+
+# Size of the chunks read from the response when streaming
+CHUNK_SIZE = 16384
+
+# Aliases for team names that differ between the sites of kicker.de beyond
+# what normalize_name evens out, as 'alias': 'name' pairs with the name as
+# on the site of the teams. There are none known so far.
+TEAM_ALIASES = {}
+
+# Transliterations of umlauts, as in names written without them
+UMLAUTS = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue"})
+
+
+def select_stat(title: str, stats: Optional[List[str]]) -> bool:
+    """Returns True if the stat is selected. The stat can be selected by
+    its name on kicker.de or by its substituted name. If stats is None,
+    all stats are selected."""
+    return stats is None or title in stats or STATS_SUBS.get(title) in stats
+
+
+def check_stats(stats: Optional[List[str]], titles: List[str]):
+    """Raises a ValueError if one of the stats is not one of the titles of
+    the stats on kicker.de or their substituted names."""
+    if stats is None:
+        return
+    names = set(titles) | {STATS_SUBS.get(title, title) for title in titles}
+    unknown = [stat for stat in stats if stat not in names]
+    if unknown:
+        raise ValueError(
+            f"The stats {unknown} are unknown. Choose from {titles} or "
+            f"{[STATS_SUBS[t] for t in titles if t in STATS_SUBS]}."
+        )
+
+
+def normalize_name(name: str) -> str:
+    """Returns the name without line breaks, surplus whitespace, case
+    differences and umlauts or ß, e.g. 'koeln' for 'Köln'."""
+    return " ".join(name.split()).casefold().translate(UMLAUTS)
+
+
+def create_index(
+    names: List[str], aliases: Optional[Dict[str, str]] = None
+) -> Dict[str, int]:
+    """Returns a dict with the integer ID of each normalized name and
+    alias. The ID is the position of the name in names."""
+    index = {normalize_name(name): i for i, name in enumerate(names)}
+    for alias, name in (aliases or {}).items():
+        if normalize_name(name) in index:
+            index[normalize_name(alias)] = index[normalize_name(name)]
+    return index
+
+
+def get_id(index: Dict[str, int], name: str) -> int:
+    """Returns the integer ID of a name or raises a ValueError if the name
+    is not in the index."""
+    try:
+        return index[normalize_name(name)]
+    except KeyError:
+        raise ValueError(f"'{name}' is not one of {list(index)}.") from None
+
+
+def convert_stat(key: str, value: str) -> float:
+    """Converts the value of a stat from string."""
+    if key == "Laufleistung in km":
+        return float(value.replace(",", ".").replace(" km", ""))
+    return int(value.replace("%", ""))
+
+
+class BlockParser(HTMLParser):
+    """Event-based parser that only keeps the HTML of the first div with
+    each of the given classes and is done as soon as all of them have been
+    closed."""
+
+    def __init__(self, classes: List[str]):
+        super().__init__()
+        self.pending = set(classes)
+        self.parts = []
+        self.depth = 0
+        self.done = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "div":
+            class_ = " ".join((dict(attrs).get("class") or "").split())
+            if self.depth == 0 and class_ not in self.pending:
+                return
+            self.pending.discard(class_)
+            self.depth += 1
+        elif self.depth == 0:
+            return
+        self.parts.append(self.get_starttag_text())
+
+    def handle_startendtag(self, tag, attrs):
+        if self.depth > 0:
+            self.parts.append(self.get_starttag_text())
+
+    def handle_endtag(self, tag):
+        if self.depth == 0:
+            return
+        self.parts.append(f"</{tag}>")
+        if tag == "div":
+            self.depth -= 1
+            if self.depth == 0 and not self.pending:
+                self.done = True
+
+    def handle_data(self, data):
+        if self.depth > 0:
+            self.parts.append(escape(data, quote=False))
+
+
+def read_blocks(
+    chunks: Iterable[bytes], classes: List[str], encoding: Optional[str] = None
+) -> Tuple[bytes, int]:
+    """Feeds the chunks of a site into a BlockParser until the divs with the
+    classes have been read.
+
+    Parameters:
+    -----------
+        chunks : Iterable[bytes]
+            The chunks of the site.
+        classes : List[str]
+            The classes of the divs.
+        encoding : Optional[str]
+            The charset from the Content-Type header. If None, the charset
+            of the meta tag in the first chunk or else UTF-8 is used.
+
+    Returns:
+    --------
+        html : bytes
+            The divs, encoded as UTF-8 with a meta tag saying so.
+        n_bytes : int
+            The number of bytes read from the chunks.
+    """
+
+    parser = BlockParser(classes)
+    decoder = None
+    n_bytes = 0
+    for chunk in chunks:
+        if decoder is None:
+            encoding = (
+                encoding
+                or EncodingDetector.find_declared_encoding(chunk, is_html=True)
+                or "utf-8"
+            )
+            decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        n_bytes += len(chunk)
+        parser.feed(decoder.decode(chunk))
+        if parser.done:
+            break
+    else:
+        if decoder is not None:
+            parser.feed(decoder.decode(b"", final=True))
+        parser.close()
+
+    html = '<meta charset="utf-8">' + "".join(parser.parts)
+    return html.encode("utf-8"), n_bytes
+
+
+def get_html(url: str, classes: Optional[List[str]] = None) -> bytes:
+    """Returns the site of an url.
+
+    Parameters:
+    -----------
+        url : str
+            The url of the site.
+        classes : Optional[List[str]]
+            If None, the whole site is downloaded. Else the site is streamed
+            into read_blocks and the connection is closed as soon as the
+            divs with these classes have been read. Only these divs are
+            returned then.
+
+    Returns:
+    --------
+        html : bytes
+            The site or divs.
+    """
+
+    if classes is None:
+        return requests.get(url).content
+
+    with requests.get(url, stream=True) as response:
+        # requests falls back to ISO-8859-1 for text without a charset
+        encoding = (
+            response.encoding
+            if "charset" in response.headers.get("Content-Type", "")
+            else None
+        )
+        html, _ = read_blocks(
+            response.iter_content(chunk_size=CHUNK_SIZE), classes, encoding
+        )
+
+    return html
+
+
+def get_soup(
+    url: str, classes: Optional[List[str]] = None
+) -> BeautifulSoup:
+    """Returns the parsed site of an url, see get_html."""
+    return BeautifulSoup(get_html(url, classes), "html.parser")
+
+
+def check_league_season(league: str, season: str):
+    """Raises a ValueError if the league or the season is not supported."""
+    if league not in LEAGUES:
+        raise ValueError(f"The league most be one of {LEAGUES}.")
+    if season not in SEASONS_BULI:
+        raise ValueError(f"The season most be one of {SEASONS_BULI}.")
+    if league != "bundesliga" and season not in SEASONS_OTHERS:
+        raise ValueError(
+            f"The season for {league} must be one of {SEASONS_OTHERS}."
+        )
 
 
 def check_internet():
@@ -82,6 +360,13 @@ def get_urls_matchday(
         "html.parser",
     )
 
+    return parse_urls_matchday(soup, url_type)
+
+
+def parse_urls_matchday(soup: BeautifulSoup, url_type=0) -> List[str]:
+    """Returns the urls of all matches from the parsed site of a match day,
+    see get_urls_matchday."""
+
     # Getting all analyse links
     urls = []
     for link in soup.find_all("a"):
@@ -107,58 +392,83 @@ def get_urls_matchday(
     return urls
 
 
-def get_stats_matchday(urls: List[str]) -> List[pd.DataFrame]:
-    """Returns all game stats from a match day."""
+class StatsRecord(NamedTuple):
+    """Game stats of a match."""
+
+    team_home: str
+    team_away: str
+    titles: Tuple[str, ...]
+    values_home: Tuple[str, ...]
+    values_away: Tuple[str, ...]
+
+
+def get_stats_matchday(
+    urls: List[str],
+    stats: Optional[List[str]] = None,
+    stream: bool = False,
+    check: bool = False,
+) -> List[StatsRecord]:
+    """Returns all game stats from a match day. If stats is given, only
+    these stats are kept. If stream is True, only the needed parts of the
+    sites are downloaded and parsed. If check is True, the stats are
+    checked on the first site, see parse_stats_match."""
 
     stats_matchday = []
 
     # Iterate over all matches
-    for url in urls:
+    for i, url in enumerate(urls):
 
-        soup = BeautifulSoup(
-            requests.get("https://www.kicker.de" + url).content, "html.parser"
+        soup = get_soup(
+            "https://www.kicker.de" + url, STATS_CLASSES if stream else None
         )
 
-        # Getting the data grid
-        data_grid = soup.find("div", class_="kick__compare-select")
+        # Add stats
+        stats_matchday.append(parse_stats_match(soup, stats, check and i == 0))
 
-        # Getting list of data grid rows
-        list_data_grid = data_grid.find_all("div", class_="kick__stats-bar")
-
-        # Getting the data grid
-        class_ = "kick__data-grid--max-width kick_" "_data-grid--max-width"
-        data_grid = soup.find("div", class_=class_)
+    return stats_matchday
 
-        # Getting list of data grid rows
-        list_data_grid = data_grid.find_all("div", class_="kick__stats-bar")
 
-        # Get data for title and teams
-        title, team1, team2 = [], [], []
-        for i_list_data_grid in list_data_grid:
-            class_ = "kick__stats-bar__title"
-            title.append(i_list_data_grid.find("div", class_=class_).text)
-            class_ = "kick__stats-bar__value kick__stats-bar__value--opponent"
-            team1.append(
-                i_list_data_grid.find("div", class_=class_ + "1").text
-            )
-            team2.append(
-                i_list_data_grid.find("div", class_=class_ + "2").text
-            )
+def parse_stats_match(
+    soup: BeautifulSoup,
+    stats: Optional[List[str]] = None,
+    check: bool = False,
+) -> StatsRecord:
+    """Returns the game stats from the parsed game stats site of a match.
+    If stats is given, only these stats are kept. Stats that are missing on
+    the site are skipped, unless check is True. Then a ValueError is raised
+    for them, which is meant for the first site of a scrape to catch
+    misspelled stats before the other sites are downloaded."""
+
+    # Getting the data grid
+    data_grid = soup.find("div", class_=STATS_CLASSES[0])
+
+    # Getting list of data grid rows
+    list_data_grid = data_grid.find_all("div", class_="kick__stats-bar")
+
+    if check:
+        class_ = "kick__stats-bar__title"
+        check_stats(
+            stats,
+            [i.find("div", class_=class_).text for i in list_data_grid],
+        )
 
-        # Get team names
-        class1 = "kick__compare-select__row kick__compare-select__row--left"
-        class2 = "kick__compare-select__row kick__compare-select__row--right"
-        col1 = soup.find("div", class_=class1).text.replace("\n", "")
-        col2 = soup.find("div", class_=class2).text.replace("\n", "")
+    # Get data for title and teams
+    title, team1, team2 = [], [], []
+    for i_list_data_grid in list_data_grid:
+        class_ = "kick__stats-bar__title"
+        i_title = i_list_data_grid.find("div", class_=class_).text
+        if not select_stat(i_title, stats):
+            continue
+        title.append(i_title)
+        class_ = "kick__stats-bar__value kick__stats-bar__value--opponent"
+        team1.append(i_list_data_grid.find("div", class_=class_ + "1").text)
+        team2.append(i_list_data_grid.find("div", class_=class_ + "2").text)
 
-        # Add stats as dataframe
-        stats_matchday.append(
-            pd.DataFrame(
-                list(zip(team1, team2)), columns=[col1, col2], index=title
-            )
-        )
+    # Get team names
+    col1 = soup.find("div", class_=STATS_CLASSES[1]).text.replace("\n", "")
+    col2 = soup.find("div", class_=STATS_CLASSES[2]).text.replace("\n", "")
 
-    return stats_matchday
+    return StatsRecord(col1, col2, tuple(title), tuple(team1), tuple(team2))
 
 
 def save_stats_matchday(
@@ -168,107 +478,545 @@ def save_stats_matchday(
         stats_matchday.to_excel(writer, sheet_name=str(matchday), index=False)
 
 
-def get_visitors_matchday(urls_matchday: List[str]) -> pd.DataFrame:
-    """Returns all the visitors of all matches from a match day."""
+class VisitorsRecord(NamedTuple):
+    """Visitors of a match."""
+
+    team_home: str
+    team_away: str
+    visitors: Optional[str]
+    sold_out: bool
 
-    df_visitors_matchday = pd.DataFrame(
-        columns=["Heimteam", "Auswärtsteam", "Zuschauer", "Ausverkauft"]
-    )
+
+def get_visitors_matchday(
+    urls_matchday: List[str], stream: bool = False
+) -> List[VisitorsRecord]:
+    """Returns all the visitors of all matches from a match day. If stream
+    is True, only the needed parts of the sites are downloaded and
+    parsed."""
+
+    visitors_matchday = []
 
     # Iterate over all matches
-    for i, url in enumerate(urls_matchday):
+    for url in urls_matchday:
+
+        soup = get_soup(
+            "https://www.kicker.de" + url, VISITORS_CLASSES if stream else None
+        )
+
+        # Add visitors
+        visitors_matchday.append(parse_visitors_match(soup))
+
+    return visitors_matchday
+
+
+def parse_visitors_match(soup: BeautifulSoup) -> VisitorsRecord:
+    """Returns the visitors from the parsed game info site of a match."""
 
-        soup = BeautifulSoup(
-            requests.get("https://www.kicker.de" + url).content, "html.parser"
+    # Get team names
+    teams = soup.find("div", class_=VISITORS_CLASSES[0])
+    class_ = "kick__v100-gameCell__team__name"
+    teams = teams.find_all("div", class_=class_)
+    team_home = teams[0].text[:-1]
+    team_away = teams[1].text[:-1]
+
+    # Getting the visitors
+    visitors = soup.find("div", class_=VISITORS_CLASSES[1])
+    if visitors:
+        visitors = (
+            visitors.text.replace("Zuschauer", "")
+            .replace("\r", "")
+            .replace("\n", "")
+            .replace(".", "")
         )
+    else:
+        visitors = None
+
+    # Check if sold out
+    sold_out_str = "(ausverkauft)"
+    if sold_out_str in visitors:
+        sold_out = True
+        visitors = visitors.replace(sold_out_str, "")
+    else:
+        sold_out = False
+
+    return VisitorsRecord(team_home, team_away, visitors, sold_out)
+
+
+class StatsSeason(NamedTuple):
+    """Game stats of the matches of a season with the integer IDs of the
+    teams and stats. Entry k of the arrays belongs to match k, column i of
+    the values to the stat with the ID i. Missing stats are NaN."""
+
+    titles: List[str]
+    matchdays: np.ndarray
+    teams_home: np.ndarray
+    teams_away: np.ndarray
+    values_home: np.ndarray
+    values_away: np.ndarray
+
+
+class VisitorsSeason(NamedTuple):
+    """Visitors of the matches of a season with the integer IDs of the
+    teams. Entry k of the arrays belongs to match k."""
+
+    matchdays: np.ndarray
+    teams_home: np.ndarray
+    teams_away: np.ndarray
+    visitors: np.ndarray
+    sold_out: np.ndarray
+
+
+def encode_stats(
+    records: List[Tuple[int, StatsRecord]], team_index: Dict[str, int]
+) -> StatsSeason:
+    """Returns the StatsSeason of the records of the matches with their
+    match days. The teams are looked up in team_index once per match and
+    the stats get their IDs in order of appearance, as some matches have
+    stats that others do not have."""
+
+    stat_index = {}
+    matches = []
+    for matchday, record in records:
+        stat_ids = [
+            stat_index.setdefault(title, len(stat_index))
+            for title in record.titles
+        ]
+        team_home = get_id(team_index, record.team_home)
+        team_away = get_id(team_index, record.team_away)
+        matches.append((matchday, team_home, team_away, stat_ids, record))
+
+    # Change keys for some stats
+    titles = list(stat_index)
+    keys = [STATS_SUBS.get(title, title) for title in titles]
+
+    values_home = np.full((len(matches), len(titles)), np.nan)
+    values_away = np.full((len(matches), len(titles)), np.nan)
+    for k, (_, _, _, stat_ids, record) in enumerate(matches):
+        for i, value_home, value_away in zip(
+            stat_ids, record.values_home, record.values_away
+        ):
+            values_home[k, i] = convert_stat(keys[i], value_home)
+            values_away[k, i] = convert_stat(keys[i], value_away)
+
+    matchdays, teams_home, teams_away = (
+        np.array([match[j] for match in matches], dtype=int)
+        for j in range(3)
+    )
+    return StatsSeason(
+        titles, matchdays, teams_home, teams_away, values_home, values_away
+    )
+
+
+def encode_visitors(
+    records: List[Tuple[int, VisitorsRecord]], team_index: Dict[str, int]
+) -> VisitorsSeason:
+    """Returns the VisitorsSeason of the records of the matches with their
+    match days. The teams are looked up in team_index once per match."""
+    return VisitorsSeason(
+        np.array([matchday for matchday, _ in records], dtype=int),
+        np.array(
+            [get_id(team_index, r.team_home) for _, r in records], dtype=int
+        ),
+        np.array(
+            [get_id(team_index, r.team_away) for _, r in records], dtype=int
+        ),
+        np.array([r.visitors for _, r in records], dtype=object),
+        np.array([r.sold_out for _, r in records], dtype=bool),
+    )
+
+
+def scrape_season(
+    league: str,
+    season: str,
+    first_matchday: int = 1,
+    last_matchday: Optional[int] = None,
+    stats: Optional[List[str]] = None,
+    visitors: bool = True,
+    stream: bool = False,
+    callback: Optional[Callable[[int], None]] = None,
+) -> Tuple[List[str], StatsSeason, Optional[VisitorsSeason]]:
+    """Returns the teams, the game stats and the visitors of the match days
+    from first_matchday to last_matchday of a season. The ID of each team
+    is its position in the teams.
+
+    Parameters:
+    -----------
+        league : str
+            Name of the league.
+        season : str
+            The season.
+        first_matchday : int
+            The first match day.
+        last_matchday : Optional[int]
+            The last match day. If None, the last match day of the league.
+        stats : Optional[List[str]]
+            If given, only these stats are kept.
+        visitors : bool
+            If False, the visitors are not scraped.
+        stream : bool
+            If True, only the needed parts of the match sites are
+            downloaded and parsed.
+        callback : Optional[Callable[[int], None]]
+            If given, it is called with each match day before it is
+            scraped, e.g. for a progress bar.
+
+    Returns:
+    --------
+        teams : List[str]
+            The name of the teams.
+        stats_season : StatsSeason
+            The game stats of each match.
+        visitors_season : Optional[VisitorsSeason]
+            The visitors of each match. None if visitors is False.
+    """
+
+    if last_matchday is None:
+        last_matchday = MATCHDAYS[league]
+
+    teams = get_teams(league, season)
 
-        # Get team names
-        class_ = "kick__v100-gameCell kick__v100-gameCell--big"
-        teams = soup.find("div", class_=class_)
-        class_ = "kick__v100-gameCell__team__name"
-        teams = teams.find_all("div", class_=class_)
-        team_home = teams[0].text[:-1]
-        team_away = teams[1].text[:-1]
-
-        # Getting the visitors
-        visitors = soup.find(
-            "div", class_="kick__gameinfo-block kick__tabular-nums"
+    stats_records = []
+    visitors_records = []
+    for matchday in range(first_matchday, last_matchday + 1):
+        print(matchday)
+        if callback is not None:
+            callback(matchday)
+
+        urls_matchday = get_urls_matchday(league, season, matchday)
+        stats_matchday = get_stats_matchday(
+            urls_matchday, stats, stream, matchday == first_matchday
         )
-        if visitors:
-            visitors = (
-                visitors.text.replace("Zuschauer", "")
-                .replace("\r", "")
-                .replace("\n", "")
-                .replace(".", "")
+        stats_records += [(matchday, record) for record in stats_matchday]
+
+        if not visitors:
+            continue
+        urls_matchday = get_urls_matchday(league, season, matchday, url_type=1)
+        visitors_matchday = get_visitors_matchday(urls_matchday, stream)
+        visitors_records += [
+            (matchday, record) for record in visitors_matchday
+        ]
+
+    # Map the names to IDs once, all tables are built from the IDs
+    team_index = create_index(teams, TEAM_ALIASES)
+    stats_season = encode_stats(stats_records, team_index)
+    visitors_season = None
+    if visitors:
+        visitors_season = encode_visitors(visitors_records, team_index)
+
+    return teams, stats_season, visitors_season
+
+
+def parse_page(
+    kind: str,
+    html: bytes,
+    stats: Optional[List[str]] = None,
+    check: bool = False,
+) -> Tuple[object, float]:
+    """Parses a site in a worker process of scrape_season_pipeline and
+    returns the record and the time spent.
+
+    Parameters:
+    -----------
+        kind : str
+            'matchday' for the site of a match day, 'stats' for the game
+            stats site or 'visitors' for the game info site of a match.
+        html : bytes
+            The site.
+        stats : Optional[List[str]]
+            If given, only these stats are kept.
+        check : bool
+            If True, the stats are checked, see parse_stats_match.
+
+    Returns:
+    --------
+        record : object
+            The urls for the game stats and for the game info of the
+            matches of a match day, a StatsRecord or a VisitorsRecord.
+        seconds : float
+            The time spent parsing.
+    """
+
+    start = time.perf_counter()
+    soup = BeautifulSoup(html, "html.parser")
+    if kind == "matchday":
+        record = (parse_urls_matchday(soup, 0), parse_urls_matchday(soup, 1))
+    elif kind == "stats":
+        record = parse_stats_match(soup, stats, check)
+    else:
+        record = parse_visitors_match(soup)
+    return record, time.perf_counter() - start
+
+
+def scrape_season_pipeline(
+    league: str,
+    season: str,
+    first_matchday: int = 1,
+    last_matchday: Optional[int] = None,
+    stats: Optional[List[str]] = None,
+    visitors: bool = True,
+    stream: bool = False,
+    n_fetchers: int = 8,
+    n_parsers: Optional[int] = None,
+    report_interval: float = 5.0,
+) -> Tuple[List[str], StatsSeason, Optional[VisitorsSeason]]:
+    """Returns the same as scrape_season, but downloads and parses the
+    sites in a pipeline.
+
+    Fetcher threads download the sites into a bounded queue, a process
+    pool of parsers turns them into records and the calling thread
+    aggregates the records and queues the sites of the matches of each
+    match day. The fetchers wait while the queue of downloaded sites is
+    full and at most twice as many sites as there are parsers are parsed
+    at the same time, so memory stays bounded. The depths of the queues and
+    the utilization of the stages are printed every report_interval
+    seconds and at the end.
+
+    Parameters:
+    -----------
+        n_fetchers : int
+            The number of fetcher threads.
+        n_parsers : Optional[int]
+            The number of parser processes. If None, the number of CPUs.
+        report_interval : float
+            The seconds between two reports. If 0, only the final report is
+            printed.
+
+    See scrape_season for the other parameters and the returns.
+    """
+
+    if last_matchday is None:
+        last_matchday = MATCHDAYS[league]
+    if n_parsers is None:
+        n_parsers = os.cpu_count() or 1
+    queue_size = 2 * n_parsers
+    classes = {
+        "matchday": None,
+        "stats": STATS_CLASSES if stream else None,
+        "visitors": VISITORS_CLASSES if stream else None,
+    }
+
+    teams = get_teams(league, season)
+
+    # Queues between the stages, only the sites are bounded
+    tasks = queue.Queue()
+    pages = queue.Queue(maxsize=queue_size)
+    records = queue.Queue()
+    parse_slots = threading.Semaphore(queue_size)
+    stop = threading.Event()
+
+    # Busy seconds of the stages and sites being parsed
+    lock = threading.Lock()
+    busy = {"fetch": 0.0, "parse": 0.0, "aggregate": 0.0}
+    n_parsing = [0]
+
+    def fetch():
+        while True:
+            task = tasks.get()
+            if task is None:
+                return
+            if stop.is_set():
+                continue
+            start = time.perf_counter()
+            try:
+                html = get_html(task[3], classes[task[0]])
+            except Exception as e:
+                records.put((task, e))
+                continue
+            with lock:
+                busy["fetch"] += time.perf_counter() - start
+            pages.put((task, html))
+
+    def parsed(task, future):
+        parse_slots.release()
+        with lock:
+            n_parsing[0] -= 1
+        records.put((task, future))
+
+    def dispatch(executor):
+        while True:
+            page = pages.get()
+            if page is None:
+                return
+            if stop.is_set():
+                continue
+            task, html = page
+            parse_slots.acquire()
+            with lock:
+                n_parsing[0] += 1
+            try:
+                future = executor.submit(
+                    parse_page,
+                    task[0],
+                    html,
+                    stats,
+                    task[:3] == ("stats", first_matchday, 0),
+                )
+            except Exception as e:
+                # E.g. BrokenProcessPool if a parser died. The exception is
+                # passed on to the aggregator like a failed download and the
+                # sites are drained further, so no fetcher blocks on them.
+                parsed(task, e)
+                continue
+            future.add_done_callback(lambda f, task=task: parsed(task, f))
+
+    depths = {"tasks": [], "pages": [], "parsing": [], "records": []}
+
+    def report(wall: float, final: bool = False):
+        with lock:
+            utilization = {
+                "fetch": busy["fetch"] / (n_fetchers * wall),
+                "parse": busy["parse"] / (n_parsers * wall),
+                "aggregate": busy["aggregate"] / wall,
+            }
+        if final:
+            queues = ", ".join(
+                f"{name} max {max(values, default=0)} "
+                f"mean {sum(values) / max(len(values), 1):.1f}"
+                for name, values in depths.items()
             )
         else:
-            visitors = None
+            queues = ", ".join(
+                f"{name} {values[-1] if values else 0}"
+                for name, values in depths.items()
+            )
+        print(
+            f"Queues: {queues} | Utilization: "
+            + ", ".join(f"{k} {v:.0%}" for k, v in utilization.items())
+        )
 
-        # Check if sold out
-        sold_out_str = "(ausverkauft)"
-        if sold_out_str in visitors:
-            sold_out = True
-            visitors = visitors.replace(sold_out_str, "")
-        else:
-            sold_out = False
-
-        # Add to DataFrame
-        df_visitors_matchday.loc[i] = [
-            team_home,
-            team_away,
-            visitors,
-            sold_out,
-        ]
+    executor = ProcessPoolExecutor(
+        n_parsers, mp_context=multiprocessing.get_context("spawn")
+    )
+    fetchers = [threading.Thread(target=fetch) for _ in range(n_fetchers)]
+    dispatcher = threading.Thread(target=dispatch, args=(executor,))
+    for thread in fetchers + [dispatcher]:
+        thread.start()
+
+    stats_records = {}
+    visitors_records = {}
+    n_tasks = 0
+    for matchday in range(first_matchday, last_matchday + 1):
+        url = f"https://www.kicker.de/{league}/spieltag/{season}/{matchday}"
+        tasks.put(("matchday", matchday, 0, url))
+        n_tasks += 1
+        stats_records[matchday] = {}
+        visitors_records[matchday] = {}
+
+    start = time.perf_counter()
+    last_report = start
+    try:
+        while n_tasks > 0:
+            task, result = records.get()
+            aggregate_start = time.perf_counter()
+            n_tasks -= 1
+            if isinstance(result, Exception):
+                raise result
+            record, seconds = result.result()
+
+            kind, matchday, i, _ = task
+            if kind == "matchday":
+                print(matchday)
+                urls_stats, urls_visitors = record
+                for i, url in enumerate(urls_stats):
+                    url = "https://www.kicker.de" + url
+                    tasks.put(("stats", matchday, i, url))
+                    n_tasks += 1
+                for i, url in enumerate(urls_visitors if visitors else []):
+                    url = "https://www.kicker.de" + url
+                    tasks.put(("visitors", matchday, i, url))
+                    n_tasks += 1
+            elif kind == "stats":
+                stats_records[matchday][i] = record
+            else:
+                visitors_records[matchday][i] = record
+
+            depths["tasks"].append(tasks.qsize())
+            depths["pages"].append(pages.qsize())
+            with lock:
+                depths["parsing"].append(n_parsing[0])
+                busy["parse"] += seconds
+                busy["aggregate"] += time.perf_counter() - aggregate_start
+            depths["records"].append(records.qsize())
+            now = time.perf_counter()
+            if report_interval and now - last_report >= report_interval:
+                report(now - start)
+                last_report = now
+    finally:
+        stop.set()
+        for _ in fetchers:
+            tasks.put(None)
+        for thread in fetchers:
+            thread.join()
+        pages.put(None)
+        dispatcher.join()
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    report(max(time.perf_counter() - start, 1e-9), final=True)
+
+    # Map the names to IDs once, all tables are built from the IDs
+    team_index = create_index(teams, TEAM_ALIASES)
+    stats_season = encode_stats(
+        [
+            (matchday, records_matchday[i])
+            for matchday, records_matchday in stats_records.items()
+            for i in sorted(records_matchday)
+        ],
+        team_index,
+    )
+    visitors_season = None
+    if visitors:
+        visitors_season = encode_visitors(
+            [
+                (matchday, records_matchday[i])
+                for matchday, records_matchday in visitors_records.items()
+                for i in sorted(records_matchday)
+            ],
+            team_index,
+        )
 
-    return df_visitors_matchday
+    return teams, stats_season, visitors_season
 
 
 def create_stats_tables(
-    stats_season: List[pd.DataFrame], teams: List[str]
+    stats_season: StatsSeason,
+    teams: List[str],
+    stats: Optional[List[str]] = None,
 ) -> Dict[str, pd.DataFrame]:
-    """Order stats in home and away tables."""
-
-    # Get keys for dict
-    keys = list(stats_season[0][0].index)
+    """Order stats in home and away tables. If stats is given, only the
+    tables for these stats are created."""
+
+    # Get IDs of the stats and keys for dict
+    stat_ids = [
+        i
+        for i, title in enumerate(stats_season.titles)
+        if select_stat(title, stats)
+    ]
+    titles = [stats_season.titles[i] for i in stat_ids]
 
     # Change keys for some stats
-    subs = {
-        "Laufleistung": "Laufleistung in km",
-        "Passquote": "Passquote in %",
-        "Ballbesitz": "Ballbesitz in %",
-        "Zweikampfquote": "Zweikampfquote in %",
+    keys = [STATS_SUBS.get(title, title) for title in titles]
+
+    # Fill arrays with shape (stat, team, opponent)
+    shape = (len(keys), len(teams), len(teams))
+    values_home = np.full(shape, np.nan)
+    values_away = np.full(shape, np.nan)
+    teams_home, teams_away = stats_season.teams_home, stats_season.teams_away
+    values_home[:, teams_home, teams_away] = stats_season.values_home[
+        :, stat_ids
+    ].T
+    values_away[:, teams_away, teams_home] = stats_season.values_away[
+        :, stat_ids
+    ].T
+
+    # Create dicts
+    stats_home = {
+        key: pd.DataFrame(values_home[i], index=teams, columns=teams)
+        for i, key in enumerate(keys)
+    }
+    stats_away = {
+        key: pd.DataFrame(values_away[i], index=teams, columns=teams)
+        for i, key in enumerate(keys)
     }
-    keys = [subs.get(key, key) for key in keys]
-
-    # Create empty dicts
-    stats_home = dict(zip(keys, [None] * len(keys)))
-    stats_away = dict(zip(keys, [None] * len(keys)))
-
-    # Iterate over keys/stats
-    for i, key in enumerate(keys):
-        df_home = pd.DataFrame(index=teams, columns=teams)
-        df_away = pd.DataFrame(index=teams, columns=teams)
-        for matchday in range(len(stats_season)):
-            for match in range(len(stats_season[matchday])):
-                series = stats_season[matchday][match].iloc[i]
-                index = list(series.index)
-                values = list(series.values)
-
-                # Convert from string
-                if key == "Laufleistung in km":
-                    values0 = float(
-                        values[0].replace(",", ".").replace(" km", "")
-                    )
-                    values1 = float(
-                        values[1].replace(",", ".").replace(" km", "")
-                    )
-                else:
-                    values0 = int(values[0].replace("%", ""))
-                    values1 = int(values[1].replace("%", ""))
-                df_home.loc[index[0]][index[1]] = values0
-                df_away.loc[index[1]][index[0]] = values1
-        stats_home[key] = df_home
-        stats_away[key] = df_away
 
     return stats_home, stats_away
 
@@ -286,16 +1034,253 @@ def add_sum_mean_std(stats_tables: List[pd.DataFrame]) -> List[pd.DataFrame]:
     return stats_tables
 
 
-def replace_ballbesitz(
-    visitors_season: List[pd.DataFrame],
-) -> List[pd.DataFrame]:
+def create_matchday_table(
+    stats_season: StatsSeason, teams: List[str]
+) -> pd.DataFrame:
+    """Returns a home/away table with the match day of each match."""
+    matchdays = np.full((len(teams), len(teams)), np.nan)
+    matchdays[stats_season.teams_home, stats_season.teams_away] = (
+        stats_season.matchdays
+    )
+    return pd.DataFrame(matchdays, index=teams, columns=teams)
+
+
+def create_cumulative_tables(
+    stats_tables: Dict[str, pd.DataFrame],
+    matchday_table: pd.DataFrame,
+    teams: List[str],
+    away: bool = False,
+) -> Dict[str, Dict[str, np.ndarray]]:
+    """Returns the cumulative sums, counts and sums of squares per match
+    day of the rows and columns of the stats tables.
+
+    Parameters:
+    -----------
+        stats_tables : Dict[str, pd.DataFrame]
+            The home or away tables from create_stats_tables.
+        matchday_table : pd.DataFrame
+            The match day of each match from create_matchday_table.
+        teams : List[str]
+            The name of the teams. The rows and columns of the tables are
+            taken by position, as the ID of each team is its position.
+        away : bool
+            True for the away tables, whose rows are the away teams. The
+            matchday_table is transposed then, as its rows are the home
+            teams.
+
+    Returns:
+    --------
+        cumulative_tables : Dict[str, Dict[str, np.ndarray]]
+            For each stat the arrays 'rows_sum', 'rows_count',
+            'rows_sumsq', 'cols_sum', 'cols_count' and 'cols_sumsq' with
+            shape (number of match days + 1, number of teams), where the
+            entry [n, i] is the value for team i as of match day n, and the
+            arrays 'values' and 'matchdays' with the values and the match
+            days of the matches.
+    """
+
+    n_teams = len(teams)
+    matchdays = matchday_table.iloc[:n_teams, :n_teams].to_numpy(dtype=float)
+    if away:
+        matchdays = matchdays.T
+    n_matchdays = 0 if np.isnan(matchdays).all() else int(np.nanmax(matchdays))
+
+    cumulative_tables = {}
+    for key, df in stats_tables.items():
+        values = df.iloc[:n_teams, :n_teams].to_numpy(dtype=float)
+        rows, cols = np.nonzero(~np.isnan(values) & ~np.isnan(matchdays))
+        matchdays_played = matchdays[rows, cols].astype(int)
+        values_played = values[rows, cols]
+
+        arrays = {"values": values, "matchdays": matchdays}
+        for axis, index in (("rows", rows), ("cols", cols)):
+            for name, x in (
+                ("sum", values_played),
+                ("count", np.ones_like(values_played)),
+                ("sumsq", values_played ** 2),
+            ):
+                array = np.zeros((n_matchdays + 1, n_teams))
+                np.add.at(array, (matchdays_played, index), x)
+                arrays[f"{axis}_{name}"] = np.cumsum(array, axis=0)
+        cumulative_tables[key] = arrays
+
+    return cumulative_tables
+
+
+def get_mean_std(
+    sums: np.ndarray, counts: np.ndarray, sumsqs: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns mean and standard deviation (with one degree of freedom
+    like pandas) from sums, counts and sums of squares."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        means = np.where(counts > 0, sums / counts, np.nan)
+        variances = (sumsqs - sums * means) / (counts - 1)
+    stds = np.where(counts > 1, np.sqrt(np.clip(variances, 0, None)), np.nan)
+    return means, stds
+
+
+def get_sum_mean_std(
+    arrays: Dict[str, np.ndarray],
+    axis: str,
+    first_matchday: int,
+    last_matchday: int,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Returns sum, mean and standard deviation of the rows or columns
+    ('rows' or 'cols') of a table from create_cumulative_tables over the
+    match days from first_matchday to last_matchday."""
+
+    n_matchdays = len(arrays[f"{axis}_sum"]) - 1
+    last = min(max(last_matchday, 0), n_matchdays)
+    first = min(max(first_matchday - 1, 0), last)
+
+    sums, counts, sumsqs = (
+        arrays[f"{axis}_{name}"][last] - arrays[f"{axis}_{name}"][first]
+        for name in ("sum", "count", "sumsq")
+    )
+
+    return (sums, *get_mean_std(sums, counts, sumsqs))
+
+
+def create_stats_tables_window(
+    cumulative_tables: Dict[str, Dict[str, np.ndarray]],
+    teams: List[str],
+    first_matchday: int,
+    last_matchday: int,
+) -> Dict[str, pd.DataFrame]:
+    """Returns the stats tables with sum, mean and standard deviation like
+    add_sum_mean_std, but only with the matches from first_matchday to
+    last_matchday."""
+
+    stats_tables = {}
+    for key, arrays in cumulative_tables.items():
+        matchdays = arrays["matchdays"]
+        in_window = (matchdays >= first_matchday) & (
+            matchdays <= last_matchday
+        )
+        df = pd.DataFrame(
+            np.where(in_window, arrays["values"], np.nan),
+            index=teams,
+            columns=teams,
+        )
+        cols_sum, cols_mean, cols_std = get_sum_mean_std(
+            arrays, "cols", first_matchday, last_matchday
+        )
+        rows_sum, rows_mean, rows_std = get_sum_mean_std(
+            arrays, "rows", first_matchday, last_matchday
+        )
+        df.loc["Summe"] = cols_sum
+        df["Summe"] = pd.Series(rows_sum, index=teams)
+        df.loc["Mittelwert"] = np.append(cols_mean, np.nan)
+        df["Mittelwert"] = pd.Series(rows_mean, index=teams)
+        df.loc["Standardabweichung"] = np.append(cols_std, [np.nan] * 2)
+        df["Standardabweichung"] = pd.Series(rows_std, index=teams)
+        stats_tables[key] = df
+
+    return stats_tables
+
+
+def create_evolution_tables(
+    cumulative_tables_home: Dict[str, Dict[str, np.ndarray]],
+    cumulative_tables_away: Dict[str, Dict[str, np.ndarray]],
+    teams: List[str],
+    first_matchday: int = 1,
+) -> Dict[str, pd.DataFrame]:
+    """Returns for each stat a table with sum, mean and standard deviation
+    of the home and away stats of each team as of each match day from
+    first_matchday on."""
+
+    evolution_tables = {}
+    for key in cumulative_tables_home:
+        columns = {}
+        for name, arrays in (
+            ("Heim", cumulative_tables_home[key]),
+            ("Auswärts", cumulative_tables_away[key]),
+        ):
+            sums, counts, sumsqs = (
+                arrays[f"rows_{i}"][first_matchday:]
+                for i in ("sum", "count", "sumsq")
+            )
+            means, stds = get_mean_std(sums, counts, sumsqs)
+            columns[f"{name} Summe"] = sums.ravel()
+            columns[f"{name} Mittelwert"] = means.ravel()
+            columns[f"{name} Standardabweichung"] = stds.ravel()
+        n_matchdays = len(cumulative_tables_home[key]["rows_sum"]) - 1
+        index = pd.MultiIndex.from_product(
+            [range(first_matchday, n_matchdays + 1), teams],
+            names=["Spieltag", "Team"],
+        )
+        evolution_tables[key] = pd.DataFrame(columns, index=index)
+
+    return evolution_tables
+
+
+def save_cumulative_tables(
+    filepath: str,
+    teams: List[str],
+    first_matchday: int,
+    cumulative_tables_home: Dict[str, Dict[str, np.ndarray]],
+    cumulative_tables_away: Dict[str, Dict[str, np.ndarray]],
+):
+    """Saves the cumulative home and away tables to a .npz file, so that
+    the tables of match day windows and the evolution tables can be
+    created later without scraping again, see load_cumulative_tables."""
+    arrays = {
+        "teams": np.array(teams),
+        "stats": np.array(list(cumulative_tables_home)),
+        "first_matchday": np.array(first_matchday),
+    }
+    for side, cumulative_tables in (
+        ("home", cumulative_tables_home),
+        ("away", cumulative_tables_away),
+    ):
+        for i, tables in enumerate(cumulative_tables.values()):
+            for name, array in tables.items():
+                arrays[f"{side}_{i}_{name}"] = array
+    np.savez_compressed(filepath, **arrays)
+
+
+def load_cumulative_tables(
+    filepath: str,
+) -> Tuple[
+    List[str],
+    int,
+    Dict[str, Dict[str, np.ndarray]],
+    Dict[str, Dict[str, np.ndarray]],
+]:
+    """Returns the teams, the first match day and the cumulative home and
+    away tables saved with save_cumulative_tables."""
+    with np.load(filepath) as npz:
+        teams = npz["teams"].tolist()
+        stats = npz["stats"].tolist()
+        first_matchday = int(npz["first_matchday"])
+        cumulative_tables_home, cumulative_tables_away = (
+            {
+                key: {
+                    name[len(f"{side}_{i}_"):]: npz[name]
+                    for name in npz.files
+                    if name.startswith(f"{side}_{i}_")
+                }
+                for i, key in enumerate(stats)
+            }
+            for side in ("home", "away")
+        )
+    return (
+        teams,
+        first_matchday,
+        cumulative_tables_home,
+        cumulative_tables_away,
+    )
+
+
+def replace_ballbesitz(visitors_season: VisitorsSeason) -> VisitorsSeason:
     """Replaces the 'Ballbesitz' entries for matches with 0 visitors."""
-    for visitors_matchday in visitors_season:
-        for row_index, row in visitors_matchday.iterrows():
-            print
-            if row.Zuschauer.startswith("Ballbesitz"):
-                visitors_matchday.loc[row_index, "Zuschauer"] = "0"
-    return visitors_season
+    visitors = visitors_season.visitors.copy()
+    for k, visitors_match in enumerate(visitors):
+        if visitors_match is not None and visitors_match.startswith(
+            "Ballbesitz"
+        ):
+            visitors[k] = "0"
+    return visitors_season._replace(visitors=visitors)
 
 
 # def write_to_xlsx(visitors_season: List[pd.DataFrame], filepath: str):
@@ -317,18 +1302,20 @@ def replace_ballbesitz(
 
 
 def create_visitors_tables(
-    visitors_season: List[pd.DataFrame], teams: List[str]
+    visitors_season: VisitorsSeason, teams: List[str]
 ) -> Dict[str, pd.DataFrame]:
 
+    visitors = np.full((len(teams), len(teams)), np.nan, dtype=object)
+    sold_out = np.full((len(teams), len(teams)), np.nan, dtype=object)
+    teams_home = visitors_season.teams_home
+    teams_away = visitors_season.teams_away
+    visitors[teams_home, teams_away] = visitors_season.visitors
+    sold_out[teams_home, teams_away] = visitors_season.sold_out
+
     visitors_tables = {
-        "Zuschauer": pd.DataFrame(index=teams, columns=teams),
-        "Ausverkauft": pd.DataFrame(index=teams, columns=teams),
+        "Zuschauer": pd.DataFrame(visitors, index=teams, columns=teams),
+        "Ausverkauft": pd.DataFrame(sold_out, index=teams, columns=teams),
     }
-    for visitors_matchday in visitors_season:
-        for match in visitors_matchday.iterrows():
-            match = match[1]
-            visitors_tables["Zuschauer"].loc[match[0]][match[1]] = match[2]
-            visitors_tables["Ausverkauft"].loc[match[0]][match[1]] = match[3]
 
     # visitors_tables["Ausverkauft"].replace(1, "x")
     # visitors_tables["Ausverkauft"].replace(0, "")
@@ -348,8 +1335,17 @@ def write_to_xlsx(
     filepath: str,
     stats_tables_home: Dict[str, pd.DataFrame],
     stats_tables_away: Dict[str, pd.DataFrame],
-    visitors_tables: Dict[str, pd.DataFrame],
+    visitors_tables: Optional[Dict[str, pd.DataFrame]] = None,
 ):
+    """Writes the stats tables and, if given, the visitors tables to an
+    Excel file. Raises a ValueError if there are no tables."""
+    if visitors_tables is None:
+        visitors_tables = {}
+    if not stats_tables_home and not visitors_tables:
+        raise ValueError(
+            f"There are no tables to write to {filepath}. Select at least "
+            "one stat or the visitors."
+        )
     with pd.ExcelWriter(filepath) as writer:
         keys = stats_tables_home.keys()
         sheet_names = [key.replace("/", " oder ") for key in keys]
@@ -367,37 +1363,18 @@ def write_to_xlsx(
             visitors_table.to_excel(writer, sheet_name=sheet_name)
 
 
-def main():
+def write_evolution_to_xlsx(
+    filepath: str, evolution_tables: Dict[str, pd.DataFrame]
+):
+    """Writes the tables from create_evolution_tables to an Excel file."""
+    with pd.ExcelWriter(filepath) as writer:
+        for key, evolution_table in evolution_tables.items():
+            evolution_table.to_excel(
+                writer, sheet_name=key.replace("/", " oder ")
+            )
 
-    leagues = [
-        "bundesliga",
-        "la-liga",
-        "premier-league",
-        "serie-a",
-    ]
-    seasons_buli = [
-        "2021-22",
-        "2020-21",
-        "2019-20",
-        "2018-19",
-        "2017-18",
-        "2016-17",
-        "2015-16",
-        "2014-15",
-        "2013-14",
-    ]
-    seasons_others = [
-        "2021-22",
-        "2020-21",
-        "2019-20",
-        "2018-19",
-    ]
-    matchdays = {
-        "bundesliga": 34,
-        "la-liga": 38,
-        "premier-league": 38,
-        "serie-a": 38,
-    }
+
+def main():
 
     parser = argparse.ArgumentParser()
     parser.add_argument(
@@ -405,7 +1382,7 @@ def main():
         "--league",
         const="league",
         nargs="?",
-        help=f"Choose from {leagues}.",
+        help=f"Choose from {LEAGUES}.",
         required=True,
         # choices=leagues,
     )
@@ -415,8 +1392,8 @@ def main():
         const="season",
         nargs="?",
         help=(
-            f"Choose from {seasons_buli} for 'bundesliga' or "
-            f"{seasons_others} for the other leagues."
+            f"Choose from {SEASONS_BULI} for 'bundesliga' or "
+            f"{SEASONS_OTHERS} for the other leagues."
         ),
         required=True,
         # choices=seasons_buli,
@@ -430,62 +1407,241 @@ def main():
         required=False,
         default=".",
     )
+    parser.add_argument(
+        "--stats",
+        nargs="+",
+        help=(
+            "Only scrape these stats, e.g. 'Laufleistung' or "
+            "'Laufleistung in km'. All stats are scraped by default."
+        ),
+        required=False,
+        default=None,
+    )
+    parser.add_argument(
+        "--no-visitors",
+        action="store_true",
+        help="Skip scraping the visitors.",
+    )
+    parser.add_argument(
+        "--first-matchday",
+        type=int,
+        help="The first match day to scrape.",
+        required=False,
+        default=1,
+    )
+    parser.add_argument(
+        "--last-matchday",
+        type=int,
+        help="The last match day to scrape. Defaults to the last match day.",
+        required=False,
+        default=None,
+    )
+    parser.add_argument(
+        "--evolution",
+        action="store_true",
+        help=(
+            "Also write the sum, mean and standard deviation of the stats "
+            "of each team as of each match day to an Excel file."
+        ),
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help=(
+            "Stream the sites of the matches and stop downloading as soon "
+            "as the stats or visitors have been read."
+        ),
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help=(
+            "Download the sites in fetcher threads and parse them in "
+            "parser processes at the same time."
+        ),
+    )
+    parser.add_argument(
+        "--fetchers",
+        type=int,
+        help="The number of fetcher threads of the pipeline.",
+        required=False,
+        default=8,
+    )
+    parser.add_argument(
+        "--parsers",
+        type=int,
+        help=(
+            "The number of parser processes of the pipeline. Defaults to "
+            "the number of CPUs."
+        ),
+        required=False,
+        default=None,
+    )
+    parser.add_argument(
+        "--window",
+        nargs=2,
+        type=int,
+        action="append",
+        metavar=("FIRST", "LAST"),
+        help=(
+            "Also write the stats tables of the matches from match day "
+            "FIRST to LAST to an Excel file. Can be given several times."
+        ),
+        required=False,
+        default=None,
+    )
+    parser.add_argument(
+        "--cumulative",
+        action="store_true",
+        help=(
+            "Also save the cumulative sums, counts and sums of squares of "
+            "the stats per match day, for --from-cumulative."
+        ),
+    )
+    parser.add_argument(
+        "--from-cumulative",
+        action="store_true",
+        help=(
+            "Do not scrape, but write the --evolution and --window Excel "
+            "files from the cumulative tables saved with --cumulative."
+        ),
+    )
     args = parser.parse_args()
 
-    if args.league not in leagues:
-        raise ValueError(f"The league most be one of {leagues}.")
-        sys.exit()
-    if args.season not in seasons_buli:
-        raise ValueError(f"The season most be one of {seasons_buli}.")
-        sys.exit()
-    if args.league != "bundesliga" and args.seasons not in seasons_others:
-        raise ValueError(
-            f"The season for {args.league} must be one of "
-            f"{seasons_others}."
+    try:
+        check_league_season(args.league, args.season)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.last_matchday is None:
+        args.last_matchday = MATCHDAYS[args.league]
+    if not 1 <= args.first_matchday <= args.last_matchday <= MATCHDAYS[
+        args.league
+    ]:
+        parser.error(
+            f"The match days for {args.league} must be in the range from 1 "
+            f"to {MATCHDAYS[args.league]}."
         )
-        sys.exit()
-
-    if not check_internet():
-        print("Internet connection or kicker.de down!")
-        sys.exit()
-
-    # if args.season == "all":
-    #     seasons = seasons[args.league]
-    # else:
-    #     seasons = [args.season]
 
     league = args.league
     season = args.season
 
-    teams = get_teams(league, season)
-
-    stats_season = []
-    visitors_season = []
-    for matchday in range(1, matchdays[league] + 1):
-        print(matchday)
-
-        urls_matchday = get_urls_matchday(league, season, matchday)
-        stats_matchday = get_stats_matchday(urls_matchday)
-        stats_season.append(stats_matchday)
-
-        urls_matchday = get_urls_matchday(league, season, matchday, url_type=1)
-        visitors_matchday = get_visitors_matchday(urls_matchday)
-        visitors_season.append(visitors_matchday)
+    filename = f"{league}_{season}"
+    if (args.first_matchday, args.last_matchday) != (1, MATCHDAYS[league]):
+        filename += f"_{args.first_matchday}-{args.last_matchday}"
+    cumulative_path = os.path.join(args.dir, f"{filename}_kumuliert.npz")
+    for first, last in args.window or []:
+        if not args.first_matchday <= first <= last <= args.last_matchday:
+            parser.error(
+                f"The windows must be in the range from "
+                f"{args.first_matchday} to {args.last_matchday}."
+            )
 
-    stats_tables_home, stats_tables_away = create_stats_tables(
-        stats_season, teams
-    )
-    stats_tables_home = add_sum_mean_std(stats_tables_home)
-    stats_tables_away = add_sum_mean_std(stats_tables_away)
+    if args.from_cumulative:
+        if not os.path.exists(cumulative_path):
+            parser.error(
+                f"There are no cumulative tables in {cumulative_path}. Save "
+                "them with --cumulative first."
+            )
+        (
+            teams,
+            first_matchday,
+            cumulative_tables_home,
+            cumulative_tables_away,
+        ) = load_cumulative_tables(cumulative_path)
+    else:
+        if not check_internet():
+            print("Internet connection or kicker.de down!")
+            sys.exit()
+
+        # if args.season == "all":
+        #     seasons = seasons[args.league]
+        # else:
+        #     seasons = [args.season]
+
+        # Unknown stats are only found on the first site
+        try:
+            if args.pipeline:
+                teams, stats_season, visitors_season = scrape_season_pipeline(
+                    league,
+                    season,
+                    args.first_matchday,
+                    args.last_matchday,
+                    args.stats,
+                    not args.no_visitors,
+                    args.stream,
+                    args.fetchers,
+                    args.parsers,
+                )
+            else:
+                teams, stats_season, visitors_season = scrape_season(
+                    league,
+                    season,
+                    args.first_matchday,
+                    args.last_matchday,
+                    args.stats,
+                    not args.no_visitors,
+                    args.stream,
+                )
+        except ValueError as e:
+            parser.error(str(e))
+
+        stats_tables_home, stats_tables_away = create_stats_tables(
+            stats_season, teams, args.stats
+        )
+        first_matchday = args.first_matchday
+        matchday_table = create_matchday_table(stats_season, teams)
+        cumulative_tables_home = create_cumulative_tables(
+            stats_tables_home, matchday_table, teams
+        )
+        cumulative_tables_away = create_cumulative_tables(
+            stats_tables_away, matchday_table, teams, away=True
+        )
+        stats_tables_home = add_sum_mean_std(stats_tables_home)
+        stats_tables_away = add_sum_mean_std(stats_tables_away)
 
-    visitors_season = replace_ballbesitz(visitors_season)
-    visitors_tables = create_visitors_tables(visitors_season, teams)
+        if args.no_visitors:
+            visitors_tables = None
+        else:
+            visitors_season = replace_ballbesitz(visitors_season)
+            visitors_tables = create_visitors_tables(visitors_season, teams)
 
-    filepath = os.path.join(args.dir, f"{league}_{season}.xlsx")
-    write_to_xlsx(
-        filepath, stats_tables_home, stats_tables_away, visitors_tables
-    )
+        filepath = os.path.join(args.dir, f"{filename}.xlsx")
+        write_to_xlsx(
+            filepath, stats_tables_home, stats_tables_away, visitors_tables
+        )
+        if args.cumulative:
+            save_cumulative_tables(
+                cumulative_path,
+                teams,
+                first_matchday,
+                cumulative_tables_home,
+                cumulative_tables_away,
+            )
 
+    if args.evolution:
+        filepath = os.path.join(args.dir, f"{filename}_verlauf.xlsx")
+        write_evolution_to_xlsx(
+            filepath,
+            create_evolution_tables(
+                cumulative_tables_home,
+                cumulative_tables_away,
+                teams,
+                first_matchday,
+            ),
+        )
+    for first, last in args.window or []:
+        filepath = os.path.join(
+            args.dir, f"{filename}_fenster_{first}-{last}.xlsx"
+        )
+        write_to_xlsx(
+            filepath,
+            create_stats_tables_window(
+                cumulative_tables_home, teams, first, last
+            ),
+            create_stats_tables_window(
+                cumulative_tables_away, teams, first, last
+            ),
+        )
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,397 @@
+#!venv/bin/python
+
+import argparse
+import json
+import os
+import sys
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from kicker_scraper_cli import (
+    LEAGUES,
+    SEASONS_BULI,
+    TEAM_ALIASES,
+    check_internet,
+    check_league_season,
+    create_index,
+    create_stats_tables,
+    create_visitors_tables,
+    get_id,
+    replace_ballbesitz,
+    scrape_season,
+)
+
+# Capacities of the stat and team axes of the cube
+MAX_STATS = 32
+MAX_TEAMS = 64
+
+# Stats of the visitors tables
+VISITORS_KEYS = ["Zuschauer", "Ausverkauft"]
+
+
+def open_cube(dirpath: str, mode: str = "r") -> Dict[str, object]:
+    """Opens the cube in a directory.
+
+    The cube consists of the memory-mapped arrays 'home', 'away' and
+    'visitors' with shape (league, season, stat, home team, away team),
+    stored as .npy files, and the metadata 'index' with the names of the
+    leagues, seasons, stats and teams of each league, stored as JSON. The
+    position of a name in the metadata is its position on the axis. Unlike
+    the away tables from create_stats_tables, the away array is not
+    transposed, so [..., i, j] is the match of home team i against away
+    team j in all arrays.
+
+    Parameters:
+    -----------
+        dirpath : str
+            The path of the directory of the cube.
+        mode : str
+            'r' for read only or 'r+' for reading and writing. With 'r+',
+            the cube is created if it does not exist.
+
+    Returns:
+    --------
+        cube : Dict[str, object]
+            The path 'dirpath', the metadata 'index' and the arrays.
+    """
+
+    index_path = os.path.join(dirpath, "index.json")
+    if not os.path.exists(index_path):
+        if mode == "r":
+            raise FileNotFoundError(f"There is no cube in {dirpath}.")
+        os.makedirs(dirpath, exist_ok=True)
+        index = {
+            "leagues": LEAGUES,
+            "seasons": SEASONS_BULI,
+            "stats": [],
+            "teams": {league: [] for league in LEAGUES},
+            "filled": [],
+        }
+        shape = (len(LEAGUES), len(SEASONS_BULI))
+        for name, n_stats in (
+            ("home", MAX_STATS),
+            ("away", MAX_STATS),
+            ("visitors", len(VISITORS_KEYS)),
+        ):
+            array = np.lib.format.open_memmap(
+                os.path.join(dirpath, f"{name}.npy"),
+                mode="w+",
+                dtype=np.float32,
+                shape=shape + (n_stats, MAX_TEAMS, MAX_TEAMS),
+            )
+            array[:] = np.nan
+            array.flush()
+        with open(index_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False, indent=2)
+
+    with open(index_path, encoding="utf-8") as f:
+        cube = {"dirpath": dirpath, "index": json.load(f)}
+    for name in ("home", "away", "visitors"):
+        cube[name] = np.lib.format.open_memmap(
+            os.path.join(dirpath, f"{name}.npy"), mode=mode
+        )
+
+    return cube
+
+
+def get_ids(
+    names: List[str], known: List[str], aliases: Dict[str, str], size: int
+) -> List[int]:
+    """Returns the positions of names in the list of known names and
+    appends unknown names to it. Raises a ValueError if there are more than
+    size names then."""
+    index = create_index(known, aliases)
+    ids = []
+    for name in names:
+        try:
+            ids.append(get_id(index, name))
+        except ValueError:
+            if len(known) == size:
+                raise ValueError(
+                    f"The cube has no space left for '{name}'."
+                ) from None
+            known.append(name)
+            index = create_index(known, aliases)
+            ids.append(len(known) - 1)
+    return ids
+
+
+def add_to_cube(
+    cube: Dict[str, object],
+    league: str,
+    season: str,
+    teams: List[str],
+    stats_tables_home: Dict[str, pd.DataFrame],
+    stats_tables_away: Dict[str, pd.DataFrame],
+    visitors_tables: Optional[Dict[str, pd.DataFrame]] = None,
+):
+    """Writes the tables from create_stats_tables and
+    create_visitors_tables of a season to a cube opened with mode 'r+'.
+    The rows and columns of the tables are taken by position, which is the
+    ID of each team. The away tables are transposed to home team by away
+    team. Previous values of the season are overwritten."""
+
+    index = cube["index"]
+    i_league = index["leagues"].index(league)
+    i_season = index["seasons"].index(season)
+    team_ids = get_ids(
+        teams, index["teams"][league], TEAM_ALIASES, MAX_TEAMS
+    )
+    stat_ids = get_ids(
+        list(stats_tables_home), index["stats"], {}, MAX_STATS
+    )
+    rows_cols = np.ix_(team_ids, team_ids)
+    n_teams = len(teams)
+
+    for name, stats_tables in (
+        ("home", stats_tables_home),
+        ("away", stats_tables_away),
+    ):
+        array = cube[name][i_league, i_season]
+        array[:] = np.nan
+        for stat_id, df in zip(stat_ids, stats_tables.values()):
+            values = df.iloc[:n_teams, :n_teams].to_numpy(dtype=np.float32)
+            array[stat_id][rows_cols] = values.T if name == "away" else values
+
+    array = cube["visitors"][i_league, i_season]
+    array[:] = np.nan
+    for i, key in enumerate(VISITORS_KEYS):
+        if visitors_tables is None:
+            break
+        df = visitors_tables[key].iloc[:n_teams, :n_teams]
+        array[i][rows_cols] = (
+            df.apply(pd.to_numeric, errors="coerce")
+            .to_numpy(dtype=np.float32)
+        )
+
+    for name in ("home", "away", "visitors"):
+        cube[name].flush()
+    if [league, season] not in index["filled"]:
+        index["filled"].append([league, season])
+    with open(
+        os.path.join(cube["dirpath"], "index.json"), "w", encoding="utf-8"
+    ) as f:
+        json.dump(index, f, ensure_ascii=False, indent=2)
+
+
+def get_cube_stat(
+    cube: Dict[str, object], stat: str, side: str = "home"
+) -> np.ndarray:
+    """Returns the memory-mapped array of a stat with shape (league,
+    season, home team, away team). side is 'home', 'away' or
+    'visitors'."""
+    if side == "visitors":
+        return cube["visitors"][:, :, VISITORS_KEYS.index(stat)]
+    stat_id = get_id(create_index(cube["index"]["stats"]), stat)
+    return cube[side][:, :, stat_id]
+
+
+def nan_mean(array: np.ndarray, axis) -> np.ndarray:
+    """Returns the mean without NaNs along an axis, or NaN if there are
+    only NaNs."""
+    sums = np.nansum(array, axis=axis, dtype=np.float64)
+    counts = np.count_nonzero(~np.isnan(array), axis=axis)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(counts > 0, sums / counts, np.nan)
+
+
+def get_team_stat(
+    cube: Dict[str, object],
+    league: str,
+    team: str,
+    stat: str,
+    side: str = "home",
+) -> pd.Series:
+    """Returns the mean of a stat of a team in its home matches ('home'),
+    its away matches ('away') or the visitors of its home matches
+    ('visitors') per season, e.g. the home 'Zweikampfquote in %' of a team
+    over all seasons."""
+    index = cube["index"]
+    i_league = index["leagues"].index(league)
+    team_id = get_id(
+        create_index(index["teams"][league], TEAM_ALIASES), team
+    )
+    values = get_cube_stat(cube, stat, side)[i_league]
+    # The away matches of the team are in its column
+    values = values[:, :, team_id] if side == "away" else values[:, team_id]
+    return pd.Series(
+        nan_mean(values, axis=1),
+        index=index["seasons"],
+        name=index["teams"][league][team_id],
+    ).sort_index()
+
+
+def get_league_stat(
+    cube: Dict[str, object], stat: str, side: str = "home"
+) -> pd.DataFrame:
+    """Returns the mean of a stat over all matches of each league in each
+    season."""
+    index = cube["index"]
+    return pd.DataFrame(
+        nan_mean(get_cube_stat(cube, stat, side), axis=(2, 3)),
+        index=index["leagues"],
+        columns=index["seasons"],
+    ).sort_index(axis=1)
+
+
+def query_cube(
+    cube: Dict[str, object],
+    stat: str,
+    side: str = "home",
+    leagues: Optional[List[str]] = None,
+    seasons: Optional[List[str]] = None,
+    team: Optional[str] = None,
+):
+    """Returns the mean of a stat per league and season from
+    get_league_stat or, if team is given, per season from get_team_stat
+    for the only league in leagues. leagues and seasons select the rows
+    and columns, all by default."""
+    leagues = leagues or cube["index"]["leagues"]
+    seasons = seasons or cube["index"]["seasons"]
+    unknown = [league for league in leagues if league not in LEAGUES]
+    if unknown:
+        raise ValueError(f"The leagues {unknown} are not in {LEAGUES}.")
+    if team is None:
+        table = get_league_stat(cube, stat, side)
+        return table.loc[leagues, table.columns.isin(seasons)]
+    if len(leagues) != 1:
+        raise ValueError("A team can only be queried in one league.")
+    series = get_team_stat(cube, leagues[0], team, stat, side)
+    return series[series.index.isin(seasons)]
+
+
+def main():
+
+    parser = argparse.ArgumentParser(
+        description=(
+            "Scrape seasons of leagues into a memory-mapped cube for "
+            "analyses across leagues and seasons, or with --stat print the "
+            "mean of a stat from the cube."
+        )
+    )
+    parser.add_argument(
+        "-l",
+        "--league",
+        nargs="+",
+        help=f"Choose from {LEAGUES}. All leagues by default.",
+        required=False,
+        default=None,
+    )
+    parser.add_argument(
+        "-s",
+        "--season",
+        nargs="+",
+        help=(
+            f"Choose from {SEASONS_BULI}. All seasons supported by the "
+            "league by default."
+        ),
+        required=False,
+        default=None,
+    )
+    parser.add_argument(
+        "-d",
+        "--dir",
+        help="The path for the directory of the cube.",
+        required=False,
+        default="cube",
+    )
+    parser.add_argument(
+        "--overwrite",
+        action="store_true",
+        help="Scrape seasons again that are already in the cube.",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help=(
+            "Stream the sites of the matches and stop downloading as soon "
+            "as the stats or visitors have been read."
+        ),
+    )
+    parser.add_argument(
+        "--stat",
+        help=(
+            "Print the mean of this stat per league and season from the "
+            "cube instead of scraping, e.g. 'Zweikampfquote in %%' or "
+            f"with --side visitors one of {VISITORS_KEYS}."
+        ),
+        required=False,
+    )
+    parser.add_argument(
+        "--side",
+        choices=["home", "away", "visitors"],
+        help=(
+            "Print the mean of the stat in the home matches, the away "
+            "matches or of the visitors. home by default."
+        ),
+        required=False,
+        default="home",
+    )
+    parser.add_argument(
+        "--team",
+        help=(
+            "Print the mean of the stat of this team per season. Needs "
+            "--stat and exactly one league."
+        ),
+        required=False,
+    )
+    args = parser.parse_args()
+
+    if args.stat is not None:
+        try:
+            cube = open_cube(args.dir)
+            table = query_cube(
+                cube, args.stat, args.side, args.league, args.season, args.team
+            )
+        except (FileNotFoundError, ValueError) as e:
+            parser.error(str(e))
+        print(table.to_string())
+        return
+    if args.team is not None:
+        parser.error("--team needs --stat.")
+
+    if not check_internet():
+        print("Internet connection or kicker.de down!")
+        sys.exit()
+
+    cube = open_cube(args.dir, mode="r+")
+
+    for league in args.league or LEAGUES:
+        for season in args.season or SEASONS_BULI:
+            try:
+                check_league_season(league, season)
+            except ValueError as e:
+                print(e)
+                continue
+            if (
+                [league, season] in cube["index"]["filled"]
+                and not args.overwrite
+            ):
+                continue
+            print(league, season)
+
+            teams, stats_season, visitors_season = scrape_season(
+                league, season, stream=args.stream
+            )
+            stats_tables_home, stats_tables_away = create_stats_tables(
+                stats_season, teams
+            )
+            visitors_season = replace_ballbesitz(visitors_season)
+            visitors_tables = create_visitors_tables(
+                visitors_season, teams
+            )
+            add_to_cube(
+                cube,
+                league,
+                season,
+                teams,
+                stats_tables_home,
+                stats_tables_away,
+                visitors_tables,
+            )
+
+
+if __name__ == "__main__":
+    main()
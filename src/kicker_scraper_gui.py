@@ -7,6 +7,7 @@ from PySide2 import QtCore
 from PySide2.QtGui import QIcon
 from PySide2.QtWidgets import (
     QApplication,
+    QCheckBox,
     QComboBox,
     QFileDialog,
     QHBoxLayout,
@@ -15,6 +16,7 @@ from PySide2.QtWidgets import (
     QMainWindow,
     QProgressBar,
     QPushButton,
+    QSpinBox,
     QVBoxLayout,
     QWidget,
 )
@@ -24,11 +26,8 @@ from kicker_scraper_cli import (
     check_internet,
     create_stats_tables,
     create_visitors_tables,
-    get_stats_matchday,
-    get_teams,
-    get_urls_matchday,
-    get_visitors_matchday,
     replace_ballbesitz,
+    scrape_season,
     write_to_xlsx,
 )
 
@@ -56,6 +55,7 @@ class MainWindow(QMainWindow):
         # Worker for the scraping
         self.worker = Worker(self)
         self.worker.updateProgress.connect(self.update_progressbar)
+        self.worker.failed.connect(self.worker_failed)
 
     def init_vars(self):
 
@@ -109,6 +109,11 @@ class MainWindow(QMainWindow):
         }
         self.season = self.seasons[self.league][0]
 
+        # Match days
+        self.first_matchday = 1
+        self.last_matchday = self.length
+        self.n_matchdays = self.length
+
     def init_layout(self):
 
         # Main layout
@@ -134,6 +139,32 @@ class MainWindow(QMainWindow):
         hlayout_season.addWidget(self.combobox_season)
         vlayout.addLayout(hlayout_season)
 
+        # Spinboxes match day range
+        self.spinbox_first = QSpinBox()
+        self.spinbox_first.setRange(1, self.length)
+        self.spinbox_first.setValue(1)
+        self.spinbox_last = QSpinBox()
+        self.spinbox_last.setRange(1, self.length)
+        self.spinbox_last.setValue(self.length)
+        hlayout_matchdays = QHBoxLayout()
+        hlayout_matchdays.addWidget(QLabel("Spieltage"))
+        hlayout_matchdays.addWidget(self.spinbox_first)
+        hlayout_matchdays.addWidget(QLabel("bis"))
+        hlayout_matchdays.addWidget(self.spinbox_last)
+        vlayout.addLayout(hlayout_matchdays)
+
+        # Line edit stats
+        self.line_edit_stats = QLineEdit()
+        self.line_edit_stats.setPlaceholderText(
+            "Alle Statistiken (oder z.B. Laufleistung, Passquote)"
+        )
+        vlayout.addWidget(self.line_edit_stats)
+
+        # Checkbox visitors
+        self.checkbox_visitors = QCheckBox("Zuschauer")
+        self.checkbox_visitors.setChecked(True)
+        vlayout.addWidget(self.checkbox_visitors)
+
         # # Download
         # hlayout_download = QHBoxLayout()
         # self.label_download = QLabel("Download")
@@ -157,9 +188,11 @@ class MainWindow(QMainWindow):
 
         # Progress bar
         self.progress_bar = QProgressBar()
-        self.progress_bar.setRange(0, 34 + 2)
+        self.progress_bar.setRange(0, self.length + 2)
         self.progress_bar.setTextVisible(False)
         vlayout.addWidget(self.progress_bar)
+        self.spinbox_first.valueChanged.connect(self.spinbox_matchday_changed)
+        self.spinbox_last.valueChanged.connect(self.spinbox_matchday_changed)
 
         # Buttons cancel and ok
         self.button_cancel = QPushButton("Cancel")
@@ -188,10 +221,22 @@ class MainWindow(QMainWindow):
         self.length = self.lengths[i]
         self.combobox_season.clear()
         self.combobox_season.addItems(self.seasons[self.league])
-        self.progress_bar.setRange(0, self.length + 2)
-        self.progress_bar.setValue(0)
+        self.spinbox_first.setRange(1, self.length)
+        self.spinbox_last.setRange(1, self.length)
+        self.spinbox_first.setValue(1)
+        self.spinbox_last.setValue(self.length)
+        self.spinbox_matchday_changed()
         # self.update_checkbox_download()
 
+    def spinbox_matchday_changed(self):
+        self.first_matchday = self.spinbox_first.value()
+        self.last_matchday = self.spinbox_last.value()
+        self.n_matchdays = self.last_matchday - self.first_matchday + 1
+        self.progress_bar.setRange(0, max(self.n_matchdays, 0) + 2)
+        self.progress_bar.setValue(0)
+        if self.line_edit_folder.text() != "":
+            self.button_ok.setEnabled(self.n_matchdays > 0)
+
     def combobox_season_changed(self):
         self.season = self.combobox_season.currentText()
         self.progress_bar.setValue(0)
@@ -218,12 +263,9 @@ class MainWindow(QMainWindow):
             return 0
 
         # Disable widget
-        self.combobox_league.setEnabled(False)
-        self.combobox_season.setEnabled(False)
+        self.set_widgets_enabled(False)
         # self.checkbox_download.setEnabled(False)
         # self.label_download.setEnabled(False)
-        self.button_folder.setEnabled(False)
-        self.button_ok.setEnabled(False)
 
         # Reset progress bar
         self.progress_bar.setValue(0)
@@ -237,18 +279,31 @@ class MainWindow(QMainWindow):
     def update_progressbar(self, progress):
         self.progress_bar.setValue(progress)
         # Enable widgets
-        if progress == self.length + 2:
-            self.combobox_league.setEnabled(True)
-            self.combobox_season.setEnabled(True)
+        if progress == self.n_matchdays + 2:
+            self.set_widgets_enabled(True)
             # self.label_download.setEnabled(True)
             # self.update_checkbox_download()
-            self.button_folder.setEnabled(True)
-            self.button_ok.setEnabled(True)
+
+    def set_widgets_enabled(self, enabled):
+        self.combobox_league.setEnabled(enabled)
+        self.combobox_season.setEnabled(enabled)
+        self.spinbox_first.setEnabled(enabled)
+        self.spinbox_last.setEnabled(enabled)
+        self.line_edit_stats.setEnabled(enabled)
+        self.checkbox_visitors.setEnabled(enabled)
+        self.button_folder.setEnabled(enabled)
+        self.button_ok.setEnabled(enabled)
+
+    def worker_failed(self, message):
+        self.progress_bar.setValue(0)
+        self.set_widgets_enabled(True)
+        self.widget_message = MessageWidget(message)
+        self.widget_message.show()
 
     def button_folder_clicked(self):
         self.folder = QFileDialog.getExistingDirectory()
         self.line_edit_folder.setText(self.folder)
-        if self.line_edit_folder.text() == "":
+        if self.line_edit_folder.text() == "" or self.n_matchdays < 1:
             self.button_ok.setEnabled(False)
         else:
             self.button_ok.setEnabled(True)
@@ -267,58 +322,90 @@ class InternetWidget(QWidget):
         self.setLayout(vlayout)
 
 
+class MessageWidget(QWidget):
+    """Window that pops up if the scraping failed."""
+
+    def __init__(self, message):
+        super(MessageWidget, self).__init__()
+        self.setWindowFlags(QtCore.Qt.WindowCloseButtonHint)
+        self.setWindowTitle("Kicker Scraper")
+        vlayout = QVBoxLayout()
+        label = QLabel(message)
+        label.setWordWrap(True)
+        vlayout.addWidget(label)
+        self.setLayout(vlayout)
+
+
 class Worker(QtCore.QThread):
     """Worker class for scraping stats from kicker.de"""
 
     updateProgress = QtCore.Signal(int)
+    failed = QtCore.Signal(str)
 
     def __init__(self, parent=None):
         QtCore.QThread.__init__(self)
         self.parent = parent
 
     def run(self):
+        try:
+            self.scrape()
+        except ValueError as e:
+            self.failed.emit(str(e))
+
+    def scrape(self):
 
         league = self.parent.league
         season = self.parent.season
         length = self.parent.length
+        first_matchday = self.parent.first_matchday
+        last_matchday = self.parent.last_matchday
+        n_matchdays = self.parent.n_matchdays
+        visitors = self.parent.checkbox_visitors.isChecked()
+        stats = [
+            stat.strip()
+            for stat in self.parent.line_edit_stats.text().split(",")
+            if stat.strip() != ""
+        ]
+        if not stats:
+            stats = None
+        filename = f"{league}_{season}"
+        if (first_matchday, last_matchday) != (1, length):
+            filename += f"_{first_matchday}-{last_matchday}"
         filepath = os.path.join(
-            self.parent.line_edit_folder.text(), f"{league}_{season}.xlsx"
+            self.parent.line_edit_folder.text(), f"{filename}.xlsx"
         )
 
-        teams = get_teams(league, season)
-
-        stats_season = []
-        visitors_season = []
-        for matchday in range(1, length + 1):
-            print(matchday)
-            self.updateProgress.emit(matchday)
-
-            urls_matchday = get_urls_matchday(league, season, matchday)
-            stats_matchday = get_stats_matchday(urls_matchday)
-            stats_season.append(stats_matchday)
-
-            urls_matchday = get_urls_matchday(
-                league, season, matchday, url_type=1
-            )
-            visitors_matchday = get_visitors_matchday(urls_matchday)
-            visitors_season.append(visitors_matchday)
+        teams, stats_season, visitors_season = scrape_season(
+            league,
+            season,
+            first_matchday,
+            last_matchday,
+            stats,
+            visitors,
+            callback=lambda matchday: self.updateProgress.emit(
+                matchday - first_matchday + 1
+            ),
+        )
 
         stats_tables_home, stats_tables_away = create_stats_tables(
-            stats_season, teams
+            stats_season, teams, stats
         )
         stats_tables_home = add_sum_mean_std(stats_tables_home)
         stats_tables_away = add_sum_mean_std(stats_tables_away)
 
-        visitors_season = replace_ballbesitz(visitors_season)
-        visitors_tables = create_visitors_tables(visitors_season, teams)
+        if visitors:
+            visitors_season = replace_ballbesitz(visitors_season)
+            visitors_tables = create_visitors_tables(visitors_season, teams)
+        else:
+            visitors_tables = None
 
-        self.updateProgress.emit(self.parent.length + 1)
+        self.updateProgress.emit(n_matchdays + 1)
 
         write_to_xlsx(
             filepath, stats_tables_home, stats_tables_away, visitors_tables
         )
 
-        self.updateProgress.emit(self.parent.length + 2)
+        self.updateProgress.emit(n_matchdays + 2)
 
 
 if __name__ == "__main__":
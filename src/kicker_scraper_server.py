@@ -0,0 +1,308 @@
+#!venv/bin/python
+
+import argparse
+import hashlib
+import json
+import sys
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict
+from urllib.parse import quote, unquote
+
+from kicker_scraper_cli import (
+    add_sum_mean_std,
+    check_internet,
+    check_league_season,
+    create_stats_tables,
+    create_visitors_tables,
+    replace_ballbesitz,
+    scrape_season,
+)
+
+# Content types of the formats served
+CONTENT_TYPES = {
+    "json": "application/json; charset=utf-8",
+    "csv": "text/csv; charset=utf-8",
+}
+
+# Names of the visitors tables
+VISITORS_TABLES = ["Zuschauer", "Ausverkauft"]
+
+
+def create_response(body: bytes, content_type: str) -> Dict[str, object]:
+    """Returns a response with body, content type and ETag."""
+    return {
+        "body": body,
+        "content_type": content_type,
+        "etag": f'"{hashlib.sha1(body).hexdigest()}"',
+    }
+
+
+def create_responses(
+    league: str, season: str, stream: bool = False
+) -> Dict[str, Dict[str, object]]:
+    """Scrapes a season and returns the responses for all of its tables.
+
+    Parameters:
+    -----------
+        league : str
+            Name of the league.
+        season : str
+            The season.
+        stream : bool
+            If True, only the needed parts of the match sites are
+            downloaded and parsed.
+
+    Returns:
+    --------
+        responses : Dict[str, Dict[str, object]]
+            The responses by path below /<league>/<season>, e.g.
+            'stats/home/Laufleistung in km.json' or 'visitors/Zuschauer.csv',
+            and '' for the list of the paths of all tables.
+    """
+
+    teams, stats_season, visitors_season = scrape_season(
+        league, season, stream=stream
+    )
+    stats_tables_home, stats_tables_away = create_stats_tables(
+        stats_season, teams
+    )
+    tables = {}
+    for side, stats_tables in (
+        ("home", add_sum_mean_std(stats_tables_home)),
+        ("away", add_sum_mean_std(stats_tables_away)),
+    ):
+        for key, df in stats_tables.items():
+            tables[f"stats/{side}/{key.replace('/', ' oder ')}"] = df
+    visitors_season = replace_ballbesitz(visitors_season)
+    visitors_tables = create_visitors_tables(visitors_season, teams)
+    for key, df in visitors_tables.items():
+        tables[f"visitors/{key}"] = df
+
+    responses = {
+        "": create_response(
+            json.dumps(
+                [
+                    f"/{league}/{season}/{quote(path)}.{extension}"
+                    for path in tables
+                    for extension in CONTENT_TYPES
+                ],
+                ensure_ascii=False,
+            ).encode("utf-8"),
+            CONTENT_TYPES["json"],
+        )
+    }
+    for path, df in tables.items():
+        responses[f"{path}.json"] = create_response(
+            df.to_json(orient="split", force_ascii=False).encode("utf-8"),
+            CONTENT_TYPES["json"],
+        )
+        responses[f"{path}.csv"] = create_response(
+            df.to_csv().encode("utf-8"), CONTENT_TYPES["csv"]
+        )
+
+    return responses
+
+
+def check_path(path: str) -> bool:
+    """Returns True if a path below /<league>/<season> has the form of the
+    paths from create_responses, so that no season is scraped for other
+    paths. The names of the stats are only known after scraping."""
+    if path == "":
+        return True
+    name, _, extension = path.rpartition(".")
+    if extension not in CONTENT_TYPES:
+        return False
+    parts = name.split("/")
+    if len(parts) == 3 and parts[0] == "stats":
+        return parts[1] in ("home", "away") and parts[2] != ""
+    return len(parts) == 2 and parts[0] == "visitors" and (
+        parts[1] in VISITORS_TABLES
+    )
+
+
+class SeasonCache:
+    """Thread-safe LRU cache for the responses of the seasons. Each season
+    is only loaded once, even if it is requested by several threads at the
+    same time."""
+
+    def __init__(
+        self,
+        load: Callable[[str, str], Dict[str, Dict[str, object]]],
+        maxsize: int = 8,
+    ):
+        self.load = load
+        self.maxsize = maxsize
+        self.seasons = OrderedDict()
+        self.lock = threading.Lock()
+        self.loading = {}
+
+    def get(self, league: str, season: str) -> Dict[str, Dict[str, object]]:
+        key = (league, season)
+        with self.lock:
+            if key in self.seasons:
+                self.seasons.move_to_end(key)
+                return self.seasons[key]
+            load_lock = self.loading.setdefault(key, threading.Lock())
+
+        with load_lock:
+            with self.lock:
+                if key in self.seasons:
+                    self.seasons.move_to_end(key)
+                    return self.seasons[key]
+            try:
+                responses = self.load(league, season)
+            except BaseException:
+                with self.lock:
+                    self.loading.pop(key, None)
+                raise
+            # Insert and release the season at once so that no other thread
+            # finds it neither cached nor loading in between
+            with self.lock:
+                self.loading.pop(key, None)
+                self.seasons[key] = responses
+                while len(self.seasons) > self.maxsize:
+                    self.seasons.popitem(last=False)
+
+        return responses
+
+
+def create_handler(cache: SeasonCache) -> type:
+    """Returns a request handler class serving the tables from the cache
+    under /<league>/<season>/<path>."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            parts = unquote(self.path.split("?")[0]).strip("/").split("/", 2)
+            if len(parts) < 2:
+                self.send_error(404)
+                return
+            league, season = parts[:2]
+            path = parts[2] if len(parts) == 3 else ""
+            try:
+                check_league_season(league, season)
+            except ValueError as e:
+                self.send_error(404, explain=str(e))
+                return
+            if not check_path(path):
+                self.send_error(404)
+                return
+
+            try:
+                responses = cache.get(league, season)
+            except Exception as e:
+                # The message goes into the status line, which must be
+                # latin-1, so the details only go into the body
+                self.send_error(
+                    502,
+                    explain=f"Scraping {league} {season} failed: {e}",
+                )
+                return
+            response = responses.get(path)
+            if response is None:
+                self.send_error(404)
+                return
+
+            if self.headers.get("If-None-Match") == response["etag"]:
+                self.send_response(304)
+                self.send_header("ETag", response["etag"])
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", response["content_type"])
+            self.send_header("Content-Length", str(len(response["body"])))
+            self.send_header("ETag", response["etag"])
+            self.end_headers()
+            self.wfile.write(response["body"])
+
+    return Handler
+
+
+def main():
+
+    parser = argparse.ArgumentParser(
+        description=(
+            "Serve the home/away tables as JSON or CSV, e.g. "
+            "/bundesliga/2021-22/stats/home/Laufleistung in km.json or "
+            "/bundesliga/2021-22/visitors/Zuschauer.csv. "
+            "/<league>/<season> lists all tables of a season."
+        )
+    )
+    parser.add_argument(
+        "--host",
+        help="The host to listen on.",
+        required=False,
+        default="127.0.0.1",
+    )
+    parser.add_argument(
+        "-p",
+        "--port",
+        type=int,
+        help="The port to listen on.",
+        required=False,
+        default=8000,
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        help="The number of seasons kept in memory.",
+        required=False,
+        default=8,
+    )
+    parser.add_argument(
+        "--preload",
+        nargs="+",
+        metavar="LEAGUE/SEASON",
+        help=(
+            "Scrape these seasons before serving, e.g. bundesliga/2021-22. "
+            "Other seasons are scraped at their first request."
+        ),
+        required=False,
+        default=[],
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help=(
+            "Stream the sites of the matches and stop downloading as soon "
+            "as the stats or visitors have been read."
+        ),
+    )
+    args = parser.parse_args()
+
+    preload = []
+    for name in args.preload:
+        league, _, season = name.partition("/")
+        try:
+            check_league_season(league, season)
+        except ValueError as e:
+            parser.error(str(e))
+        preload.append((league, season))
+    if len(preload) > args.cache_size:
+        parser.error(
+            f"Only {args.cache_size} seasons fit into the cache, see "
+            "--cache-size."
+        )
+
+    if not check_internet():
+        print("Internet connection or kicker.de down!")
+        sys.exit()
+
+    cache = SeasonCache(
+        lambda league, season: create_responses(league, season, args.stream),
+        args.cache_size,
+    )
+    for league, season in preload:
+        print(f"Loading {league} {season}")
+        cache.get(league, season)
+    server = ThreadingHTTPServer((args.host, args.port), create_handler(cache))
+    print(f"Serving on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
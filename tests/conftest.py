@@ -0,0 +1,18 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, os.path.dirname(__file__))
+
+import kicker_scraper_cli  # noqa: E402
+from fake_kicker import FakeKicker  # noqa: E402
+
+
+@pytest.fixture
+def kicker(monkeypatch):
+    """Serves the fake sites instead of kicker.de."""
+    fake = FakeKicker()
+    monkeypatch.setattr(kicker_scraper_cli.requests, "get", fake)
+    return fake
@@ -0,0 +1,173 @@
+"""Fake sites of kicker.de with a small season of four teams."""
+
+from typing import Dict, Optional, Set, Tuple
+
+TEAMS = ["Bayern München", "1. FC Köln", "Hertha BSC", "SC Freiburg"]
+
+# Home and away team of the matches of each match day
+FIXTURES = [
+    [(0, 1), (2, 3)],
+    [(1, 2), (3, 0)],
+    [(0, 2), (1, 3)],
+    [(1, 0), (3, 2)],
+    [(2, 1), (0, 3)],
+    [(2, 0), (3, 1)],
+]
+
+TITLES = ["Tore", "Torschüsse", "Laufleistung", "Ballbesitz"]
+
+# Navigation, ads and scripts around the blocks with the data
+FILLER = "<div class='kick__nav'><p>Werbung</p></div>"
+
+
+def get_slug(matchday: int, i: int) -> str:
+    home, away = FIXTURES[matchday - 1][i]
+    return f"/team{home}-gegen-team{away}-{matchday}"
+
+
+def get_stats(matchday: int, i: int) -> Dict[str, Tuple[str, str]]:
+    """Returns the home and away value of each stat of a match as on the
+    site."""
+    home, away = FIXTURES[matchday - 1][i]
+    possession = 40 + 5 * ((matchday + i) % 4)
+    return {
+        "Tore": (str((matchday + home) % 4), str((matchday * away) % 3)),
+        "Torschüsse": (str(10 + matchday + home), str(5 + i + away)),
+        "Laufleistung": (
+            f"{110 + matchday},{home} km",
+            f"{112 - matchday},{away} km",
+        ),
+        "Ballbesitz": (f"{possession}%", f"{100 - possession}%"),
+    }
+
+
+def get_visitors(matchday: int, i: int) -> Tuple[str, bool]:
+    """Returns the visitors of a match as on the site and if it was sold
+    out."""
+    home, _ = FIXTURES[matchday - 1][i]
+    return f"{20 + 10 * home + matchday}.000", home == 0
+
+
+class FakeResponse:
+    def __init__(self, content: bytes, charset: Optional[str], kicker):
+        self.content = content
+        self.headers = {
+            "Content-Type": "text/html"
+            + (f"; charset={charset}" if charset else "")
+        }
+        self.encoding = charset or "ISO-8859-1"
+        self.kicker = kicker
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding)
+
+    def iter_content(self, chunk_size: int):
+        for i in range(0, len(self.content), chunk_size):
+            chunk = self.content[i:i + chunk_size]
+            self.kicker.bytes_read += len(chunk)
+            yield chunk
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+
+class FakeKicker:
+    """Replacement for requests.get that serves the fake sites.
+
+    missing holds (matchday, i, title) of stats missing on a site. The
+    sites are encoded with charset and declare it in a meta tag, the
+    Content-Type header only if header_charset is True. Each site ends
+    with n_filler times FILLER."""
+
+    def __init__(
+        self,
+        missing: Optional[Set[Tuple[int, int, str]]] = None,
+        charset: str = "utf-8",
+        header_charset: bool = True,
+        n_filler: int = 20,
+    ):
+        self.missing = missing or set()
+        self.n_filler = n_filler
+        self.charset = charset
+        self.header_charset = header_charset
+        self.urls = []
+        self.bytes_read = 0
+
+    def get_site(self, path: str) -> str:
+        if "/vereine/" in path:
+            return "".join(
+                '<td class="kick__t__a__l kick__table--ranking__teamname '
+                'kick__table--ranking__index kick__respt-m-w-160">'
+                f"\n{team}\n</td>"
+                for team in TEAMS
+            )
+        if "/spieltag/" in path:
+            matchday = int(path.rsplit("/", 1)[1])
+            return "".join(
+                f'<a href="{get_slug(matchday, i)}/analyse">Analyse</a>' * 2
+                for i in range(len(FIXTURES[matchday - 1]))
+            )
+        slug, kind = path.rsplit("/", 1)
+        for matchday in range(1, len(FIXTURES) + 1):
+            for i in range(len(FIXTURES[matchday - 1])):
+                if get_slug(matchday, i) == slug:
+                    if kind == "spieldaten":
+                        return self.get_stats_site(matchday, i)
+                    return self.get_visitors_site(matchday, i)
+        raise ValueError(f"There is no site {path}.")
+
+    def get_stats_site(self, matchday: int, i: int) -> str:
+        home, away = FIXTURES[matchday - 1][i]
+        bars = "".join(
+            '<div class="kick__stats-bar">'
+            f'<div class="kick__stats-bar__title">{title}</div>'
+            '<div class="kick__stats-bar__value '
+            f'kick__stats-bar__value--opponent1">{value_home}</div>'
+            '<div class="kick__stats-bar__value '
+            f'kick__stats-bar__value--opponent2">{value_away}</div>'
+            "</div>"
+            for title, (value_home, value_away) in get_stats(
+                matchday, i
+            ).items()
+            if (matchday, i, title) not in self.missing
+        )
+        return (
+            '<div class="kick__compare-select__row '
+            f'kick__compare-select__row--left">\n{TEAMS[home]}\n</div>'
+            '<div class="kick__compare-select__row '
+            f'kick__compare-select__row--right">\n{TEAMS[away]}\n</div>'
+            '<div class="kick__data-grid--max-width '
+            f'kick__data-grid--max-width">{bars}</div>'
+        )
+
+    def get_visitors_site(self, matchday: int, i: int) -> str:
+        home, away = FIXTURES[matchday - 1][i]
+        visitors, sold_out = get_visitors(matchday, i)
+        return (
+            '<div class="kick__v100-gameCell kick__v100-gameCell--big">'
+            '<div class="kick__v100-gameCell__team__name">'
+            f"{TEAMS[home]} </div>"
+            '<div class="kick__v100-gameCell__team__name">'
+            f"{TEAMS[away]} </div></div>"
+            '<div class="kick__gameinfo-block kick__tabular-nums">'
+            f"Zuschauer\n{visitors}{' (ausverkauft)' if sold_out else ''}"
+            "</div>"
+        )
+
+    def __call__(self, url: str, **kwargs) -> FakeResponse:
+        self.urls.append(url)
+        path = url.split("kicker.de", 1)[1]
+        html = (
+            f'<html><head><meta charset="{self.charset}"></head><body>'
+            f"{FILLER * 20}{self.get_site(path)}{FILLER * self.n_filler}"
+            "</body></html>"
+        )
+        return FakeResponse(
+            html.encode(self.charset),
+            self.charset if self.header_charset else None,
+            self,
+        )
@@ -0,0 +1,131 @@
+import sys
+
+import numpy as np
+import pytest
+
+import kicker_scraper_cli as cli
+import kicker_scraper_cube as cube_cli
+from fake_kicker import FIXTURES, TEAMS, get_stats, get_visitors
+
+
+@pytest.fixture
+def cube(kicker, monkeypatch, tmp_path):
+    monkeypatch.setitem(cli.MATCHDAYS, "bundesliga", len(FIXTURES))
+    monkeypatch.setattr(cube_cli, "check_internet", lambda: True)
+    dirpath = str(tmp_path / "cube")
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "kicker_scraper_cube.py",
+            "-l",
+            "bundesliga",
+            "-s",
+            "2021-22",
+            "-d",
+            dirpath,
+        ],
+    )
+    cube_cli.main()
+    return cube_cli.open_cube(dirpath)
+
+
+def get_goals(side):
+    """Returns the goals of each team in its home or away matches."""
+    goals = {team: [] for team in range(len(TEAMS))}
+    for matchday, matches in enumerate(FIXTURES, 1):
+        for i, (home, away) in enumerate(matches):
+            goals_home, goals_away = get_stats(matchday, i)["Tore"]
+            if side == "home":
+                goals[home].append(int(goals_home))
+            else:
+                goals[away].append(int(goals_away))
+    return goals
+
+
+def test_axes_are_home_by_away(cube):
+    assert cube["index"]["filled"] == [["bundesliga", "2021-22"]]
+    assert cube["index"]["teams"]["bundesliga"] == TEAMS
+    i_season = cube["index"]["seasons"].index("2021-22")
+    goals_home = cube_cli.get_cube_stat(cube, "Tore", "home")[0, i_season]
+    goals_away = cube_cli.get_cube_stat(cube, "Tore", "away")[0, i_season]
+    visitors = cube_cli.get_cube_stat(cube, "Zuschauer", "visitors")
+    for matchday, matches in enumerate(FIXTURES, 1):
+        for i, (home, away) in enumerate(matches):
+            expected_home, expected_away = get_stats(matchday, i)["Tore"]
+            assert goals_home[home, away] == int(expected_home)
+            assert goals_away[home, away] == int(expected_away)
+            expected_visitors = get_visitors(matchday, i)[0]
+            assert visitors[0, i_season, home, away] == int(
+                expected_visitors.replace(".", "")
+            )
+    assert np.isnan(goals_home[0, 0])
+    assert np.isnan(goals_home[len(TEAMS):]).all()
+
+
+@pytest.mark.parametrize("side", ["home", "away"])
+def test_team_stat(cube, side):
+    goals = get_goals(side)
+    for team, name in enumerate(TEAMS):
+        series = cube_cli.get_team_stat(cube, "bundesliga", name, "Tore", side)
+        assert series.name == name
+        assert series["2021-22"] == pytest.approx(np.mean(goals[team]))
+        assert series.drop("2021-22").isna().all()
+
+
+def test_league_stat(cube):
+    goals = sum(get_goals("home").values(), [])
+    table = cube_cli.get_league_stat(cube, "Tore")
+    assert table.loc["bundesliga", "2021-22"] == pytest.approx(np.mean(goals))
+    assert table.drop(index="bundesliga").isna().all().all()
+
+
+def test_main_prints_queries(cube, monkeypatch, capsys):
+    capsys.readouterr()
+    argv = ["kicker_scraper_cube.py", "-d", cube["dirpath"], "-s", "2021-22"]
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        argv + ["-l", "bundesliga", "--stat", "Tore", "--team", "1. FC Köln"],
+    )
+    cube_cli.main()
+    season, mean = capsys.readouterr().out.split()
+    assert season == "2021-22"
+    assert float(mean) == pytest.approx(np.mean(get_goals("home")[1]))
+
+    monkeypatch.setattr(sys, "argv", argv + ["--stat", "Tore"])
+    cube_cli.main()
+    out = capsys.readouterr().out
+    assert out.split()[:2] == ["2021-22", "bundesliga"]
+    assert len(out.splitlines()) == 1 + len(cli.LEAGUES)
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["--stat", "Tore", "--team", "1. FC Köln"],
+        ["--stat", "Tore", "-l", "bundesliga", "--team", "1. FC Kölle"],
+        ["--stat", "Toore"],
+        ["--stat", "Tore", "-l", "bundesliga", "2-bundesliga"],
+        ["-l", "bundesliga", "--team", "1. FC Köln"],
+    ],
+)
+def test_main_rejects_invalid_queries(cube, monkeypatch, capsys, argv):
+    monkeypatch.setattr(
+        sys, "argv", ["kicker_scraper_cube.py", "-d", cube["dirpath"]] + argv
+    )
+    with pytest.raises(SystemExit) as e:
+        cube_cli.main()
+    assert e.value.code == 2
+    assert "error" in capsys.readouterr().err
+
+
+def test_main_without_cube(monkeypatch, capsys, tmp_path):
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["kicker_scraper_cube.py", "-d", str(tmp_path), "--stat", "Tore"],
+    )
+    with pytest.raises(SystemExit):
+        cube_cli.main()
+    assert "There is no cube" in capsys.readouterr().err
@@ -0,0 +1,144 @@
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import kicker_scraper_cli as cli
+from fake_kicker import TEAMS
+
+
+@pytest.fixture
+def season(kicker):
+    return cli.scrape_season("bundesliga", "2021-22", 1, 6, visitors=False)
+
+
+def create_cumulative_tables(teams, stats_season):
+    home, away = cli.create_stats_tables(stats_season, teams)
+    matchday_table = cli.create_matchday_table(stats_season, teams)
+    return (
+        cli.create_cumulative_tables(home, matchday_table, teams),
+        cli.create_cumulative_tables(away, matchday_table, teams, away=True),
+    )
+
+
+@pytest.mark.parametrize("first, last", [(1, 6), (2, 4), (5, 5)])
+def test_window_equals_truncated_season(season, first, last):
+    teams, stats_season, _ = season
+    cumulative_home, cumulative_away = create_cumulative_tables(
+        teams, stats_season
+    )
+    mask = (stats_season.matchdays >= first) & (
+        stats_season.matchdays <= last
+    )
+    truncated = cli.StatsSeason(
+        stats_season.titles,
+        *(array[mask] for array in stats_season[1:]),
+    )
+    home, away = cli.create_stats_tables(truncated, teams)
+    for cumulative_tables, stats_tables in (
+        (cumulative_home, cli.add_sum_mean_std(home)),
+        (cumulative_away, cli.add_sum_mean_std(away)),
+    ):
+        window = cli.create_stats_tables_window(
+            cumulative_tables, teams, first, last
+        )
+        assert list(window) == list(stats_tables)
+        for key in window:
+            pd.testing.assert_frame_equal(window[key], stats_tables[key])
+
+
+def test_away_tables_use_away_match_days():
+    teams = ["A", "B"]
+    records = [
+        (1, cli.StatsRecord("A", "B", ("Tore",), ("1",), ("2",))),
+        (2, cli.StatsRecord("B", "A", ("Tore",), ("3",), ("4",))),
+    ]
+    stats_season = cli.encode_stats(records, cli.create_index(teams))
+    cumulative_home, cumulative_away = create_cumulative_tables(
+        teams, stats_season
+    )
+    window = cli.create_stats_tables_window(cumulative_away, teams, 1, 1)
+    # Only B played away on match day 1
+    assert window["Tore"].loc["A", "Summe"] == 0
+    assert window["Tore"].loc["B", "Summe"] == 2
+    np.testing.assert_array_equal(
+        cumulative_away["Tore"]["rows_sum"], [[0, 0], [0, 2], [4, 2]]
+    )
+
+
+def test_evolution_starts_at_first_matchday(kicker):
+    teams, stats_season, _ = cli.scrape_season(
+        "bundesliga", "2021-22", 4, 6, visitors=False
+    )
+    cumulative_home, cumulative_away = create_cumulative_tables(
+        teams, stats_season
+    )
+    evolution = cli.create_evolution_tables(
+        cumulative_home, cumulative_away, teams, 4
+    )
+    table = evolution["Tore"]
+    assert list(table.index.levels[0]) == [4, 5, 6]
+    assert len(table) == 3 * len(TEAMS)
+    assert not table["Heim Summe"].isna().any()
+
+
+def test_save_and_load_cumulative_tables(season, tmp_path):
+    teams, stats_season, _ = season
+    cumulative_home, cumulative_away = create_cumulative_tables(
+        teams, stats_season
+    )
+    filepath = str(tmp_path / "kumuliert.npz")
+    cli.save_cumulative_tables(
+        filepath, teams, 1, cumulative_home, cumulative_away
+    )
+    loaded = cli.load_cumulative_tables(filepath)
+    assert loaded[:2] == (teams, 1)
+    for saved, loaded_tables in zip(
+        (cumulative_home, cumulative_away), loaded[2:]
+    ):
+        assert list(loaded_tables) == list(saved)
+        for key in saved:
+            assert loaded_tables[key].keys() == saved[key].keys()
+            for name in saved[key]:
+                np.testing.assert_array_equal(
+                    loaded_tables[key][name], saved[key][name]
+                )
+
+
+def test_main_writes_windows_from_cumulative_tables(
+    kicker, monkeypatch, tmp_path
+):
+    monkeypatch.setattr(cli, "check_internet", lambda: True)
+    argv = [
+        "kicker_scraper_cli.py",
+        "-l",
+        "bundesliga",
+        "-s",
+        "2021-22",
+        "-d",
+        str(tmp_path),
+        "--last-matchday",
+        "6",
+        "--no-visitors",
+    ]
+    monkeypatch.setattr(sys, "argv", argv + ["--cumulative"])
+    cli.main()
+    assert (tmp_path / "bundesliga_2021-22_1-6_kumuliert.npz").exists()
+
+    kicker.urls.clear()
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        argv + ["--from-cumulative", "--evolution", "--window", "2", "4"],
+    )
+    cli.main()
+    assert kicker.urls == []
+    window = pd.read_excel(
+        tmp_path / "bundesliga_2021-22_1-6_fenster_2-4.xlsx",
+        sheet_name="Tore",
+        index_col=0,
+        nrows=len(TEAMS) + 3,
+    )
+    assert list(window.index[:len(TEAMS)]) == TEAMS
+    assert (tmp_path / "bundesliga_2021-22_1-6_verlauf.xlsx").exists()
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+import kicker_scraper_cli as cli
+from fake_kicker import FIXTURES, TEAMS, get_stats
+
+
+def test_names_as_on_other_sites_get_the_same_id():
+    index = cli.create_index(TEAMS)
+    assert cli.get_id(index, "\n1. FC  Köln \n") == 1
+    assert cli.get_id(index, "1. FC Koeln") == 1
+    assert cli.get_id(index, "BAYERN MÜNCHEN") == 0
+    with pytest.raises(ValueError, match="Herta BSC"):
+        cli.get_id(index, "Herta BSC")
+
+
+def test_aliases_get_the_id_of_their_name():
+    index = cli.create_index(TEAMS, {"Hertha Berlin": "Hertha BSC"})
+    assert cli.get_id(index, "Hertha Berlin") == 2
+
+
+def test_encode_stats():
+    records = [
+        (
+            1,
+            cli.StatsRecord(
+                "A",
+                "B",
+                ("Tore", "Laufleistung"),
+                ("1", "110,5 km"),
+                ("2", "112,0 km"),
+            ),
+        ),
+        (
+            2,
+            cli.StatsRecord(
+                "b ", "a", ("Ballbesitz", "Tore"), ("45%", "3"), ("55%", "0")
+            ),
+        ),
+    ]
+    stats_season = cli.encode_stats(records, cli.create_index(["A", "B"]))
+    assert stats_season.titles == ["Tore", "Laufleistung", "Ballbesitz"]
+    np.testing.assert_array_equal(stats_season.matchdays, [1, 2])
+    np.testing.assert_array_equal(stats_season.teams_home, [0, 1])
+    np.testing.assert_array_equal(stats_season.teams_away, [1, 0])
+    np.testing.assert_array_equal(
+        stats_season.values_home, [[1, 110.5, np.nan], [3, np.nan, 45]]
+    )
+    np.testing.assert_array_equal(
+        stats_season.values_away, [[2, 112, np.nan], [0, np.nan, 55]]
+    )
+
+
+def test_encode_stats_rejects_unknown_team():
+    records = [(1, cli.StatsRecord("A", "C", ("Tore",), ("1",), ("2",)))]
+    with pytest.raises(ValueError, match="'C'"):
+        cli.encode_stats(records, cli.create_index(["A", "B"]))
+
+
+def test_encode_visitors():
+    records = [
+        (1, cli.VisitorsRecord("A", "B", "20.000", True)),
+        (3, cli.VisitorsRecord("B", "A", None, False)),
+    ]
+    visitors_season = cli.encode_visitors(
+        records, cli.create_index(["A", "B"])
+    )
+    np.testing.assert_array_equal(visitors_season.matchdays, [1, 3])
+    np.testing.assert_array_equal(visitors_season.teams_home, [0, 1])
+    np.testing.assert_array_equal(visitors_season.teams_away, [1, 0])
+    assert list(visitors_season.visitors) == ["20.000", None]
+    assert list(visitors_season.sold_out) == [True, False]
+
+
+def test_tables_are_indexed_by_the_ids(kicker):
+    teams, stats_season, visitors_season = cli.scrape_season(
+        "bundesliga", "2021-22", 1, len(FIXTURES)
+    )
+    home, away = cli.create_stats_tables(stats_season, teams)
+    visitors = cli.create_visitors_tables(visitors_season, teams)
+    for matchday, matches in enumerate(FIXTURES, 1):
+        for i, (team_home, team_away) in enumerate(matches):
+            goals_home, goals_away = get_stats(matchday, i)["Tore"]
+            assert home["Tore"].iloc[team_home, team_away] == int(goals_home)
+            assert away["Tore"].iloc[team_away, team_home] == int(goals_away)
+            assert visitors["Ausverkauft"].iloc[team_home, team_away] == (
+                team_home == 0
+            )
@@ -0,0 +1,77 @@
+import multiprocessing
+import threading
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pytest
+
+import kicker_scraper_cli as cli
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_pipeline_equals_scrape_season(kicker, stream):
+    expected = cli.scrape_season("bundesliga", "2021-22", 1, 6, stream=stream)
+    kicker.urls.clear()
+    result = cli.scrape_season_pipeline(
+        "bundesliga",
+        "2021-22",
+        1,
+        6,
+        stream=stream,
+        n_fetchers=4,
+        n_parsers=2,
+        report_interval=0,
+    )
+    # Each site once, the site of a match day only once for both kinds
+    assert len(kicker.urls) == len(set(kicker.urls)) == 1 + 6 * (1 + 2 * 2)
+    assert result[0] == expected[0]
+    assert result[1].titles == expected[1].titles
+    for season, expected_season in zip(result[1:], expected[1:]):
+        for array, expected_array in zip(season, expected_season):
+            np.testing.assert_array_equal(array, expected_array)
+
+
+def test_pipeline_raises_failed_download(kicker, monkeypatch):
+    def get(url, **kwargs):
+        if url.endswith("/spielinfo") and "-3/" in url:
+            raise ConnectionError(url)
+        return kicker(url, **kwargs)
+
+    monkeypatch.setattr(cli.requests, "get", get)
+    with pytest.raises(ConnectionError, match="spielinfo"):
+        cli.scrape_season_pipeline(
+            "bundesliga", "2021-22", 1, 6, n_parsers=2, report_interval=0
+        )
+    assert multiprocessing.active_children() == []
+
+
+def test_pipeline_raises_if_parsers_die(kicker, monkeypatch):
+    killed = threading.Event()
+
+    def get(url, **kwargs):
+        # Kill the parsers once they have parsed the match days
+        if url.endswith("/spieldaten") and not killed.is_set():
+            killed.set()
+            for process in multiprocessing.active_children():
+                process.kill()
+                process.join()
+        return kicker(url, **kwargs)
+
+    monkeypatch.setattr(cli.requests, "get", get)
+    result = []
+
+    def scrape():
+        try:
+            cli.scrape_season_pipeline(
+                "bundesliga", "2021-22", 1, 6, n_parsers=2, report_interval=0
+            )
+        except Exception as e:
+            result.append(e)
+
+    thread = threading.Thread(target=scrape, daemon=True)
+    thread.start()
+    thread.join(timeout=60)
+    assert not thread.is_alive(), "The pipeline hangs."
+    assert killed.is_set()
+    assert len(result) == 1
+    assert isinstance(result[0], BrokenProcessPool)
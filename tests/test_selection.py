@@ -0,0 +1,73 @@
+import sys
+
+import numpy as np
+import pytest
+
+import kicker_scraper_cli as cli
+from fake_kicker import TEAMS, TITLES, get_stats
+
+
+def test_scrape_season_only_requests_what_was_asked_for(kicker):
+    teams, stats_season, visitors_season = cli.scrape_season(
+        "bundesliga", "2021-22", 2, 3, ["Laufleistung in km"], visitors=False
+    )
+    assert teams == TEAMS
+    assert visitors_season is None
+    assert not any(url.endswith("/spielinfo") for url in kicker.urls)
+    # The site of the teams, two match days and two matches each
+    assert len(kicker.urls) == 1 + 2 * (1 + 2)
+    home, away = cli.create_stats_tables(
+        stats_season, teams, ["Laufleistung in km"]
+    )
+    assert list(home) == list(away) == ["Laufleistung in km"]
+    # Match day 2: team 1 at home against team 2
+    value = float(get_stats(2, 0)["Laufleistung"][0].replace(",", ".")[:-3])
+    assert home["Laufleistung in km"].iloc[1, 2] == value
+
+
+def test_unknown_stat_fails_on_first_site(kicker):
+    with pytest.raises(ValueError, match="Laufleitsung"):
+        cli.scrape_season("bundesliga", "2021-22", stats=["Laufleitsung"])
+    assert len(kicker.urls) == 3
+
+
+def test_stat_missing_in_one_match_is_skipped(kicker):
+    kicker.missing = {(2, 1, "Laufleistung")}
+    teams, stats_season, _ = cli.scrape_season(
+        "bundesliga", "2021-22", 1, 3, ["Laufleistung"], visitors=False
+    )
+    home, away = cli.create_stats_tables(stats_season, teams)
+    table = home["Laufleistung in km"].to_numpy()
+    # Match day 2: team 3 at home against team 0
+    assert np.isnan(table[3, 0])
+    assert np.count_nonzero(~np.isnan(table)) == 5
+
+    _, stats_season_all, _ = cli.scrape_season(
+        "bundesliga", "2021-22", 1, 3, visitors=False
+    )
+    home_all, _ = cli.create_stats_tables(stats_season_all, teams)
+    assert list(home_all) == [cli.STATS_SUBS.get(t, t) for t in TITLES]
+    np.testing.assert_array_equal(
+        home_all["Laufleistung in km"].to_numpy(), table
+    )
+
+
+def test_write_to_xlsx_without_tables(tmp_path):
+    with pytest.raises(ValueError, match="no tables"):
+        cli.write_to_xlsx(str(tmp_path / "empty.xlsx"), {}, {}, None)
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["-l", "bundesliga", "-s", "2021-22", "--first-matchday", "35"],
+        ["-l", "bundesliga", "-s", "2021-22", "--last-matchday", "0"],
+        ["-l", "la-liga", "-s", "2013-14"],
+    ],
+)
+def test_main_rejects_invalid_arguments(monkeypatch, capsys, argv):
+    monkeypatch.setattr(sys, "argv", ["kicker_scraper_cli.py"] + argv)
+    with pytest.raises(SystemExit) as e:
+        cli.main()
+    assert e.value.code == 2
+    assert "must be" in capsys.readouterr().err
@@ -0,0 +1,142 @@
+import json
+import threading
+from http.client import HTTPConnection
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+import kicker_scraper_cli as cli
+import kicker_scraper_server as server
+from fake_kicker import FIXTURES
+
+
+@pytest.fixture
+def serve(kicker, monkeypatch):
+    monkeypatch.setitem(cli.MATCHDAYS, "bundesliga", len(FIXTURES))
+    loaded = []
+
+    def load(league, season):
+        loaded.append((league, season))
+        return server.create_responses(league, season)
+
+    cache = server.SeasonCache(load, maxsize=2)
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), server.create_handler(cache))
+    thread = threading.Thread(
+        target=httpd.serve_forever, kwargs={"poll_interval": 0.01}
+    )
+    thread.start()
+
+    def get(path, headers=None):
+        connection = HTTPConnection("127.0.0.1", httpd.server_port)
+        connection.request("GET", path, headers=headers or {})
+        response = connection.getresponse()
+        body = response.read()
+        connection.close()
+        return response, body
+
+    yield get, loaded
+    httpd.shutdown()
+    httpd.server_close()
+    thread.join()
+
+
+def test_listed_paths_are_served(serve):
+    get, loaded = serve
+    response, body = get("/bundesliga/2021-22")
+    assert response.status == 200
+    paths = json.loads(body)
+    assert "/bundesliga/2021-22/visitors/Zuschauer.csv" in paths
+    assert "/bundesliga/2021-22/stats/away/Laufleistung%20in%20km.json" in (
+        paths
+    )
+    for path in paths:
+        response, body = get(path)
+        assert response.status == 200, path
+        assert body
+    assert loaded == [("bundesliga", "2021-22")]
+
+
+def test_etag(serve):
+    get, _ = serve
+    path = "/bundesliga/2021-22/stats/home/Tore.json"
+    response, _ = get(path)
+    etag = response.getheader("ETag")
+    response, body = get(path, {"If-None-Match": etag})
+    assert response.status == 304
+    assert body == b""
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "/bundesliga/2013-14/favicon.ico",
+        "/bundesliga/2013-14/stats/home.json",
+        "/bundesliga/2013-14/stats/both/Tore.json",
+        "/bundesliga/2013-14/visitors/Tore.csv",
+        "/bundesliga/2013-14/stats/home/Tore.xlsx",
+        "/la-liga/2013-14",
+    ],
+)
+def test_other_paths_are_not_scraped(serve, kicker, path):
+    get, loaded = serve
+    response, _ = get(path)
+    assert response.status == 404
+    assert loaded == []
+    assert kicker.urls == []
+
+
+def test_failed_scrape(kicker):
+    def load(league, season):
+        raise RuntimeError("Köln\r\nX-Injected: 1")
+
+    cache = server.SeasonCache(load)
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), server.create_handler(cache))
+    thread = threading.Thread(
+        target=httpd.serve_forever, kwargs={"poll_interval": 0.01}
+    )
+    thread.start()
+    try:
+        connection = HTTPConnection("127.0.0.1", httpd.server_port)
+        connection.request("GET", "/bundesliga/2021-22")
+        response = connection.getresponse()
+        body = response.read().decode("utf-8")
+        connection.close()
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+        thread.join()
+    assert response.status == 502
+    assert response.getheader("X-Injected") is None
+    assert "Köln" in body
+    assert cache.loading == {}
+
+
+def test_season_cache_loads_once_and_evicts():
+    loaded = []
+    release = threading.Event()
+
+    def load(league, season):
+        loaded.append(season)
+        release.wait()
+        return {"": season}
+
+    cache = server.SeasonCache(load, maxsize=2)
+    threads = [
+        threading.Thread(target=cache.get, args=("bundesliga", "2021-22"))
+        for _ in range(20)
+    ]
+    for thread in threads:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert loaded == ["2021-22"]
+
+    cache.get("bundesliga", "2020-21")
+    cache.get("bundesliga", "2021-22")
+    cache.get("bundesliga", "2019-20")
+    assert list(cache.seasons) == [
+        ("bundesliga", "2021-22"),
+        ("bundesliga", "2019-20"),
+    ]
+    assert cache.loading == {}
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+import kicker_scraper_benchmark as benchmark
+import kicker_scraper_cli as cli
+from fake_kicker import TEAMS, FakeKicker, get_slug
+
+SITES = [
+    ("stats", "spieldaten", cli.STATS_CLASSES, cli.parse_stats_match),
+    ("visitors", "spielinfo", cli.VISITORS_CLASSES, cli.parse_visitors_match),
+]
+
+
+@pytest.mark.parametrize("kind, path, classes, parse", SITES)
+@pytest.mark.parametrize(
+    "charset, header_charset",
+    [("utf-8", True), ("utf-8", False), ("iso-8859-1", False)],
+)
+def test_streamed_site_gives_same_record(
+    monkeypatch, kind, path, classes, parse, charset, header_charset
+):
+    kicker = FakeKicker(
+        charset=charset, header_charset=header_charset, n_filler=2000
+    )
+    monkeypatch.setattr(cli.requests, "get", kicker)
+    url = f"https://www.kicker.de{get_slug(1, 0)}/{path}"
+
+    record_full = parse(cli.get_soup(url))
+    n_bytes_full = len(kicker(url).content)
+    kicker.bytes_read = 0
+    record_stream = parse(cli.get_soup(url, classes))
+
+    assert record_stream == record_full
+    assert record_stream.team_home == TEAMS[0] == "Bayern München"
+    assert record_stream.team_away == TEAMS[1] == "1. FC Köln"
+    assert kicker.bytes_read < n_bytes_full / 2
+
+
+def test_scrape_season_streamed_equals_full(monkeypatch):
+    monkeypatch.setattr(cli.requests, "get", FakeKicker(n_filler=200))
+    teams, stats_full, visitors_full = cli.scrape_season(
+        "bundesliga", "2021-22", 1, 3
+    )
+    _, stats_stream, visitors_stream = cli.scrape_season(
+        "bundesliga", "2021-22", 1, 3, stream=True
+    )
+    assert stats_stream.titles == stats_full.titles
+    for season_full, season_stream in (
+        (stats_full, stats_stream),
+        (visitors_full, visitors_stream),
+    ):
+        for array_full, array_stream in zip(season_full, season_stream):
+            np.testing.assert_array_equal(array_stream, array_full)
+
+def test_benchmark_measures_recorded_sites(tmp_path):
+    kicker = FakeKicker(n_filler=2000)
+    for kind, path, _, _ in SITES:
+        url = f"https://www.kicker.de{get_slug(1, 0)}/{path}"
+        (tmp_path / f"{kind}_0.html").write_bytes(kicker(url).content)
+    results = benchmark.measure_dir(str(tmp_path))
+    assert [filename for filename, _ in results] == [
+        "stats_0.html",
+        "visitors_0.html",
+    ]
+    for _, result in results:
+        assert result["stream"][0] < result["full"][0]